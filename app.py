@@ -1,10 +1,21 @@
+import pandas as pd
 import streamlit as st
-from roster import RosterGenerator, Staff, ALL_DAYS
+from roster import Staff, ALL_DAYS
+from cache import RosterCache
+from demand import SLOTS_PER_DAY, load_demand_csv, slot_label
+from ingest import ingest_weekly_requests_csv
+from offday_calendar import OffdayCalendar, generate_offday_matrix, OFFDAY_STATUSES, REQUESTED
+from horizon import consecutive_weeks
 import datetime
 
 st.set_page_config(page_title="Retail Roster Scheduler", layout="wide")
 st.title("Retail Roster Scheduler")
 
+@st.cache_resource
+def roster_cache():
+    # One cache per server process, shared by every session.
+    return RosterCache(max_entries=128, directory=".roster_cache")
+
 # --- Staff Setup ---
 if "staff_list" not in st.session_state:
     st.session_state.staff_list = []
@@ -24,6 +35,33 @@ st.markdown("### 👥 Registered Team")
 for staff in st.session_state.staff_list:
     st.write(f"- {staff.name} ({staff.role}) – Available on: {', '.join(staff.availability)}")
 
+uploaded = st.file_uploader("📥 Import Off-Day Requests (CSV)", type="csv")
+if uploaded is not None and st.session_state.get("ingested_file") != uploaded.file_id:
+    st.session_state.ingest_report = ingest_weekly_requests_csv(uploaded, staff_list=st.session_state.staff_list)
+    st.session_state.ingested_file = uploaded.file_id
+report = st.session_state.get("ingest_report")
+if uploaded is not None and report:
+    st.caption(f"Imported {report['accepted']} of {report['rows']} rows "
+               f"({report['rows_per_second']:.0f} rows/s), {report['rejected']} rejected")
+    if report["rejects"]:
+        st.dataframe([{"Line": r["line"], "Reason": r["reason"]} for r in report["rejects"]])
+
+# --- Year Calendar ---
+# Only built when switched on; the staff grid is shown one page of people and weeks at a time.
+CALENDAR_PAGE_SIZE = 50
+if st.checkbox("🗓️ Show Year-at-a-Glance Off-Day Calendar", value=False) and st.session_state.staff_list:
+    n_weeks = st.slider("Weeks", 1, 52, 52)
+    calendar = OffdayCalendar(st.session_state.staff_list, consecutive_weeks(1, n_weeks))
+    st.markdown("**Staff available per day**")
+    st.dataframe(calendar.counts(), use_container_width=True)
+    st.caption(f"{int((calendar.status == REQUESTED).sum())} off-days requested across {n_weeks} weeks")
+    pages = -(-len(calendar.names) // CALENDAR_PAGE_SIZE)
+    page = st.number_input("Staff page", min_value=1, max_value=pages, value=1, step=1)
+    first_week, last_week = st.select_slider("Weeks shown", options=list(range(1, n_weeks + 1)),
+                                             value=(1, min(n_weeks, 4)))
+    st.dataframe(calendar.page((page - 1) * CALENDAR_PAGE_SIZE, CALENDAR_PAGE_SIZE, first_week - 1, last_week),
+                 use_container_width=True)
+
 # --- Rules ---
 st.subheader("⚙️ Scheduling Rules")
 opening = st.time_input("Store Opening", datetime.time(11, 0))
@@ -36,11 +74,26 @@ avoid_consec_incharge = st.checkbox("Avoid Consecutive In-Charge Shifts", value=
 max_close = st.slider("Max Closings per Week", 0, 7, 5)
 max_incharge = st.slider("Max In-Charge per Week", 0, 7, 3)
 enable_smart = st.checkbox("Enable Auto-Tuning", value=True)
+tune_budget = st.slider("Auto-Tuning Time Budget (seconds)", 1, 30, 3, disabled=not enable_smart)
+seed = st.number_input("Random Seed", min_value=0, value=0, step=1)
+show_diagnostics = st.checkbox("Show Diagnostics", value=False)
+
+demand_file = st.file_uploader("📈 Traffic Forecast (CSV with Day, Start, End, Required)", type="csv")
+demand = None
+if demand_file is not None:
+    if st.session_state.get("demand_file") != demand_file.file_id:
+        try:
+            st.session_state.demand = load_demand_csv(demand_file)
+        except ValueError as e:
+            st.session_state.demand = None
+            st.error(str(e))
+        st.session_state.demand_file = demand_file.file_id
+    demand = st.session_state.get("demand")
 
 # --- Generate Roster ---
 if st.button("🛠️ Generate Weekly Roster") and st.session_state.staff_list:
-    planner = RosterGenerator(
-        staff_list=st.session_state.staff_list,
+    planner = roster_cache().generate(
+        st.session_state.staff_list,
         opening_hour=opening.strftime("%H:%M"),
         closing_hour=closing.strftime("%H:%M"),
         min_staff_weekday=min_weekday,
@@ -51,12 +104,52 @@ if st.button("🛠️ Generate Weekly Roster") and st.session_state.staff_list:
         enforce_non_consecutive_incharge=avoid_consec_incharge,
         max_closing_per_week=max_close,
         max_incharge_per_week=max_incharge,
-        auto_tune_enabled=enable_smart
+        auto_tune_enabled=enable_smart,
+        auto_tune_budget=tune_budget,
+        seed=int(seed),
+        instrument=show_diagnostics,
+        demand=demand
     )
+    st.session_state.planner = planner
+
+stats = roster_cache().stats()
+st.caption(f"🗄️ Roster cache: {stats['hits'] + stats['disk_hits']} hits "
+           f"({stats['disk_hits']} from disk), {stats['misses']} misses, {stats['entries']} entries")
+
+# --- Show Roster ---
+planner = st.session_state.get("planner")
+if planner:
+    st.subheader("🛌 Off-Day Requests")
+    grid = generate_offday_matrix(planner.staff_list, planner.week_id)
+    edited = st.data_editor(
+        grid, hide_index=True, disabled=["Staff"], key="offday_grid",
+        column_config={day: st.column_config.SelectboxColumn(day, options=OFFDAY_STATUSES[:2]) for day in ALL_DAYS}
+    )
+    # Each flipped cell only repairs its own day of the roster instead of regenerating the week.
+    for row, d in zip(*(grid[ALL_DAYS] != edited[ALL_DAYS]).to_numpy().nonzero()):
+        day = ALL_DAYS[d]
+        for name, _, old, new in planner.repair(grid.at[row, "Staff"], planner.week_id, day, edited.at[row, day]):
+            st.toast(f"{name} on {day}: {old} → {new}")
 
-    roster = planner.generate()
     st.subheader("📅 Weekly Roster")
-    st.dataframe(roster.fillna(""), use_container_width=True)
+    st.dataframe(planner.roster.fillna(""), use_container_width=True)
+
+    report = planner.tuning_report
+    if report:
+        st.info(
+            f"🎯 Auto-tuning ran {report['restarts']} restarts on {report['workers']} worker(s): "
+            f"score {report['greedy_score']:.1f} → {report['best_score']:.1f} "
+            f"({report['improvement_pct']:.1f}% better than the plain greedy roster)"
+        )
+
+    if planner.coverage is not None:
+        st.subheader("📈 Coverage")
+        day = st.selectbox("Day", ALL_DAYS, key="coverage_day")
+        d = ALL_DAYS.index(day)
+        st.line_chart(pd.DataFrame(
+            {"Staffed": planner.coverage_curves()[d], "Needed": planner.coverage.demand[d]},
+            index=[slot_label(k) for k in range(SLOTS_PER_DAY)]
+        ))
 
     st.subheader("📊 Summary")
     st.dataframe(planner.summary())
@@ -65,6 +158,18 @@ if st.button("🛠️ Generate Weekly Roster") and st.session_state.staff_list:
     for issue in planner.list_violations():
         st.markdown(f"- {issue}")
 
+    diagnostics = planner.diagnostics_report()
+    if diagnostics:
+        with st.expander("🔬 Diagnostics"):
+            st.markdown("**Phase timings**")
+            st.dataframe([{"Phase": name, "Milliseconds": round(seconds * 1000, 3)}
+                          for name, seconds in diagnostics["phases"].items()])
+            st.markdown("**Candidates and operations**")
+            st.dataframe([{"Counter": key, "Value": n} for key, n in diagnostics["counters"].items()])
+            if diagnostics["events"]:
+                st.markdown("**Fallback events**")
+                st.dataframe(diagnostics["events"])
+
     if st.button("📤 Export Roster to Excel"):
         planner.export_to_excel("weekly_roster.xlsx")
         st.success("✅ Roster saved as weekly_roster.xlsx")
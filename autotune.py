@@ -0,0 +1,102 @@
+import copy
+import os
+import random
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from evaluator import RosterEvaluator
+from roster import OFF, MORNING, AFTERNOON
+
+FLEX_CODES = (OFF, MORNING, AFTERNOON)
+MOVES_PER_CELL = 40
+MOVES_PER_BATCH = 32
+
+def _propose(codes, available, rng):
+    n, days = codes.shape
+    candidate = codes.copy()
+    move = rng.random()
+    if move < 0.4 and n > 1:
+        # Swap two people's shifts on one day.
+        d = rng.randrange(days)
+        i, j = rng.sample(range(n), 2)
+        candidate[i, d], candidate[j, d] = codes[j, d], codes[i, d]
+    elif move < 0.7:
+        # Move a shift or off-day to another day of the same person's week.
+        i = rng.randrange(n)
+        a, b = rng.sample(range(days), 2)
+        candidate[i, a], candidate[i, b] = codes[i, b], codes[i, a]
+    else:
+        i, d = rng.randrange(n), rng.randrange(days)
+        if codes[i, d] not in FLEX_CODES:
+            return None
+        candidate[i, d] = rng.choice(FLEX_CODES)
+    if ((candidate > OFF) & ~available).any():
+        return None
+    return candidate
+
+def local_search(evaluator, codes, rng, deadline):
+    # Proposes moves in batches and scores each batch with one vectorized evaluator call.
+    best = codes.copy()
+    best_score = float(evaluator.score(best)[0])
+    if not best.size:
+        return best, best_score
+    for _ in range(MOVES_PER_CELL * best.size // MOVES_PER_BATCH):
+        if time.time() >= deadline:
+            break
+        candidates = [c for c in (_propose(best, evaluator.available, rng) for _ in range(MOVES_PER_BATCH)) if c is not None]
+        if not candidates:
+            continue
+        scores = evaluator.score(np.stack(candidates))
+        k = int(np.argmin(scores))
+        if scores[k] <= best_score:
+            best, best_score = candidates[k], float(scores[k])
+    return best, best_score
+
+def _search(template, week_id, carry, first_seed, step, deadline):
+    best = None
+    restarts = 0
+    seed = first_seed
+    while True:
+        planner = copy.deepcopy(template)
+        planner.seed = seed
+        planner.generate_codes(week_id, carry)
+        evaluator = RosterEvaluator(planner, week_id)
+        codes, value = local_search(evaluator, planner.codes, random.Random(seed), deadline)
+        restarts += 1
+        if best is None or value < best[0]:
+            best = (value, seed, codes)
+        seed += step
+        if time.time() >= deadline:
+            return best + (restarts,)
+
+def auto_tune(planner, template, week_id, carry=None):
+    # Multi-start search: seeded greedy restarts, each followed by a swap/toggle local
+    # search, spread over worker processes until the wall-clock budget runs out.
+    evaluator = RosterEvaluator(planner, week_id)
+    greedy_score = float(evaluator.score(planner.codes)[0])
+    workers = planner.auto_tune_workers or os.cpu_count() or 1
+    deadline = time.time() + planner.auto_tune_budget
+    first_seed = planner.seed or 0
+    if workers == 1:
+        results = [_search(template, week_id, carry, first_seed, 1, deadline)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_search, template, week_id, carry, first_seed + w, workers, deadline)
+                       for w in range(workers)]
+            results = [f.result() for f in futures]
+
+    best_score, best_seed, best_codes, _ = min(results, key=lambda r: r[0])
+    report = {
+        "greedy_score": greedy_score,
+        "best_score": min(best_score, greedy_score),
+        "best_seed": best_seed,
+        "restarts": sum(r[3] for r in results),
+        "workers": workers,
+    }
+    if best_score < greedy_score:
+        planner.apply_codes(best_codes, evaluator.describe(best_codes))
+    else:
+        report["best_seed"] = None
+    report["improvement"] = greedy_score - report["best_score"]
+    report["improvement_pct"] = 100 * report["improvement"] / greedy_score if greedy_score else 0.0
+    return report
@@ -0,0 +1,80 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from export import export_rosters
+from roster import RosterGenerator
+from store import load_staff_from_db
+from utils import load_staff_from_json
+
+def run_job(job):
+    # Every job loads its own Staff objects, so generators never share schedule state.
+    week_id = job.get("week_id", "Week 1")
+    if job["staff_file"].endswith((".db", ".sqlite")):
+        staff_list, training_schedule = load_staff_from_db(job["staff_file"], week_id)
+    else:
+        staff_list, training_schedule = load_staff_from_json(job["staff_file"])
+    rules = dict(job.get("rules", {}))
+    rules.setdefault("training_schedule", training_schedule)
+    rules.setdefault("seed", job.get("seed"))
+    if job.get("demand_file"):
+        from demand import load_demand_csv
+        rules.setdefault("demand", load_demand_csv(job["demand_file"]))
+    planner = RosterGenerator(staff_list, **rules)
+    roster = planner.generate(week_id)
+    if job.get("excel"):
+        planner.export_to_excel(job["excel"])
+    return {
+        "store": job.get("store") or os.path.splitext(os.path.basename(job["staff_file"]))[0],
+        "week_id": week_id,
+        "roster": roster,
+        "summary": planner.summary(),
+        "violations": list(planner.list_violations()),
+        "planner": planner,
+    }
+
+def generate_batch(jobs, max_workers=None):
+    jobs = list(jobs)
+    if not jobs:
+        return []
+    workers = max_workers or os.cpu_count() or 1
+    if workers == 1:
+        return [run_job(job) for job in jobs]
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(run_job, jobs, chunksize=chunksize))
+
+def combine_summaries(results):
+    import pandas as pd
+    frames = [r["summary"].assign(Store=r["store"], Week=r["week_id"]) for r in results]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+def combine_violations(results):
+    return [(r["store"], r["week_id"], issue) for r in results for issue in r["violations"]]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate rosters for many stores and weeks in parallel.")
+    parser.add_argument("jobs", help="JSON file with a list of {staff_file, week_id, rules, seed, store, excel, demand_file} jobs")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--summary", help="write the combined summary to this CSV file")
+    parser.add_argument("--export", help="write every roster to one .xlsx (a sheet per job), .csv or .parquet file")
+    args = parser.parse_args(argv)
+
+    with open(args.jobs, "r") as f:
+        jobs = json.load(f)
+
+    started = time.perf_counter()
+    results = generate_batch(jobs, max_workers=args.workers)
+    elapsed = time.perf_counter() - started
+
+    if args.summary:
+        combine_summaries(results).to_csv(args.summary, index=False)
+    if args.export:
+        export_rosters([(f"{r['store']} {r['week_id']}", r["planner"]) for r in results], args.export)
+    for store, week_id, issue in combine_violations(results):
+        print(f"[{store} / {week_id}] {issue}")
+    print(f"Generated {len(results)} rosters in {elapsed:.2f}s")
+
+if __name__ == "__main__":
+    main()
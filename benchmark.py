@@ -0,0 +1,242 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from roster import ALL_DAYS, Staff
+
+DEFAULT_STAFF = [10, 100, 1000, 10000]
+DEFAULT_WEEKS = [1, 4, 13, 52]
+TARGETS = ["generate", "summary", "export_to_excel", "load_staff_from_json", "generate_offday_matrix", "offday_calendar"]
+
+# (share of the team, available days, max_hours choices, min_off_days choices)
+WORKER_SHAPES = [
+    (0.55, ALL_DAYS, [40, 44], [2]),
+    (0.20, ALL_DAYS[:5], [24, 30], [2, 3]),
+    (0.15, ["Friday", "Saturday", "Sunday"], [16, 20], [1]),
+    (0.10, None, [20, 30, 44], [1, 2, 3]),
+]
+
+def synthetic_team(n_staff, n_weeks=1, seed=0, request_density=0.15, supervisor_share=0.1):
+    # Mix of full-timers, weekday part-timers, weekend students and people with a random set
+    # of days; each available day gets an off-day request with probability request_density.
+    rng = random.Random(seed)
+    shares = [shape[0] for shape in WORKER_SHAPES]
+    team = []
+    for k in range(n_staff):
+        _, days, hours, off_days = rng.choices(WORKER_SHAPES, weights=shares)[0]
+        availability = list(days) if days else sorted(rng.sample(ALL_DAYS, rng.randint(3, 6)), key=ALL_DAYS.index)
+        staff = Staff(f"Staff {k + 1:05d}", "Supervisor" if rng.random() < supervisor_share else "Crew",
+                      availability, max_hours=rng.choice(hours), min_off_days=rng.choice(off_days))
+        for w in range(1, n_weeks + 1):
+            requested = [day for day in availability if rng.random() < request_density]
+            if requested:
+                staff.weekly_off_requests[f"Week {w}"] = requested
+        team.append(staff)
+    return team
+
+def _plan(team, n_weeks, seed):
+    from horizon import RosterHorizon, consecutive_weeks
+    horizon = RosterHorizon(team, seed=seed)
+    horizon.generate(consecutive_weeks(1, n_weeks))
+    return horizon
+
+def _prepare(target, n_staff, n_weeks, seed, workdir):
+    # Returns the timed call; setup such as building the team is done here, untimed.
+    team = synthetic_team(n_staff, n_weeks, seed)
+    if target == "generate":
+        return lambda: _plan(team, n_weeks, seed)
+    if target == "summary":
+        horizon = _plan(team, n_weeks, seed)
+        return lambda: (horizon.summary(), horizon)
+    if target == "export_to_excel":
+        horizon = _plan(team, n_weeks, seed)
+        return lambda: (horizon.export(os.path.join(workdir, "bench.xlsx")), horizon)
+    if target == "load_staff_from_json":
+        from utils import load_staff_from_json, save_staff_to_json
+        path = os.path.join(workdir, "bench_staff.json")
+        save_staff_to_json(team, {}, path)
+        return lambda: (load_staff_from_json(path), None)
+    if target == "generate_offday_matrix":
+        from offday_calendar import generate_offday_matrix
+        return lambda: ([generate_offday_matrix(team, f"Week {w}") for w in range(1, n_weeks + 1)], None)
+    if target == "offday_calendar":
+        from horizon import consecutive_weeks
+        from offday_calendar import OffdayCalendar
+        def calendar_view():
+            calendar = OffdayCalendar(team, consecutive_weeks(1, n_weeks))
+            return (calendar.counts(), calendar.page()), None
+        return calendar_view
+    raise ValueError(f"Unknown benchmark target: {target}")
+
+def _violations(result):
+    horizon = result[1] if isinstance(result, tuple) else result
+    return len(horizon.list_violations()) if horizon is not None else None
+
+def run_case(target, n_staff, n_weeks, seed=0, measure_memory=True, repeat=3):
+    # Wall time is the best of `repeat` runs, each on freshly prepared inputs.
+    with tempfile.TemporaryDirectory() as workdir:
+        seconds = None
+        for _ in range(max(1, repeat)):
+            call = _prepare(target, n_staff, n_weeks, seed, workdir)
+            started = time.perf_counter()
+            result = call()
+            elapsed = time.perf_counter() - started
+            seconds = elapsed if seconds is None else min(seconds, elapsed)
+        peak_mb = None
+        if measure_memory:
+            # Second run under tracemalloc so its overhead stays out of the wall time.
+            call = _prepare(target, n_staff, n_weeks, seed, workdir)
+            tracemalloc.start()
+            try:
+                call()
+                peak_mb = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+            finally:
+                tracemalloc.stop()
+    return {
+        "target": target,
+        "staff": n_staff,
+        "weeks": n_weeks,
+        "seconds": round(seconds, 6),
+        "peak_mb": round(peak_mb, 3) if peak_mb is not None else None,
+        "violations": _violations(result),
+    }
+
+# Cold-start cases: the headless CLI against importing everything the GUI path loads.
+STARTUP_CASES = {
+    "cli_generate": ["{root}/cli.py", "generate", "--staff", "{root}/staff_data.json", "--seed", "0"],
+    "cli_export_xlsx": ["{root}/cli.py", "generate", "--staff", "{root}/staff_data.json", "--seed", "0",
+                        "--export", "{workdir}/startup.xlsx"],
+    "full_import": ["-c", "import streamlit, pandas, openpyxl, roster, utils"],
+}
+
+def _spawn(argv):
+    # Runs one fresh interpreter with its output discarded; returns (seconds, peak RSS in MB).
+    # Peak memory comes from wait4's resource usage and is None where that is unavailable.
+    started = time.perf_counter()
+    if hasattr(os, "wait4") and hasattr(os, "posix_spawn"):
+        devnull = [(os.POSIX_SPAWN_OPEN, fd, os.devnull, os.O_WRONLY, 0) for fd in (1, 2)]
+        pid = os.posix_spawn(argv[0], argv, os.environ, file_actions=devnull)
+        _, status, usage = os.wait4(pid, 0)
+        code, peak_mb = os.waitstatus_to_exitcode(status), usage.ru_maxrss / 1024
+    else:
+        code, peak_mb = subprocess.run(argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL).returncode, None
+    if code not in (0, 1):
+        raise RuntimeError(f"Startup case failed with exit code {code}: {' '.join(argv)}")
+    return time.perf_counter() - started, peak_mb
+
+def measure_startup(cases=STARTUP_CASES, repeat=5):
+    # Wall time is the best of `repeat` runs of each case in a fresh Python process.
+    import sys
+    root = os.path.dirname(os.path.abspath(__file__))
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for name, args in cases.items():
+            argv = [sys.executable] + [a.format(root=root, workdir=workdir) for a in args]
+            runs = [_spawn(argv) for _ in range(max(1, repeat))]
+            memory = [mb for _, mb in runs if mb is not None]
+            results.append({
+                "case": name,
+                "seconds": round(min(seconds for seconds, _ in runs), 4),
+                "peak_mb": round(max(memory), 1) if memory else None,
+            })
+    return results
+
+def _version():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10)
+        return out.stdout.strip() or "unknown"
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+
+def run_suite(targets=TARGETS, staff_sizes=DEFAULT_STAFF, week_counts=DEFAULT_WEEKS, seed=0,
+              measure_memory=True, max_cells=None, label=None, progress=None, repeat=3):
+    # max_cells skips cases whose staff x weeks x 7 roster is larger than the limit.
+    results = []
+    for target in targets:
+        for n_staff in staff_sizes:
+            for n_weeks in week_counts:
+                if max_cells and n_staff * n_weeks * len(ALL_DAYS) > max_cells:
+                    continue
+                results.append(run_case(target, n_staff, n_weeks, seed, measure_memory, repeat))
+                if progress:
+                    progress(results[-1])
+    return {
+        "label": label or _version(),
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "seed": seed,
+        "repeat": repeat,
+        "results": results,
+    }
+
+def compare(baseline, current, threshold=1.2):
+    # Pairs up cases by (target, staff, weeks); ratios above threshold count as regressions.
+    before = {(r["target"], r["staff"], r["weeks"]): r for r in baseline["results"]}
+    rows = []
+    for r in current["results"]:
+        old = before.get((r["target"], r["staff"], r["weeks"]))
+        if not old or not old["seconds"]:
+            continue
+        ratio = r["seconds"] / old["seconds"]
+        rows.append({
+            "target": r["target"], "staff": r["staff"], "weeks": r["weeks"],
+            "before": old["seconds"], "after": r["seconds"], "ratio": round(ratio, 3),
+            "regression": ratio > threshold,
+        })
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scaling benchmarks for roster generation, summary, export and loading.")
+    parser.add_argument("--targets", nargs="+", default=TARGETS, choices=TARGETS)
+    parser.add_argument("--staff", nargs="+", type=int, default=DEFAULT_STAFF)
+    parser.add_argument("--weeks", nargs="+", type=int, default=DEFAULT_WEEKS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-cells", type=int, default=None, help="skip cases with more staff x weeks x 7 cells")
+    parser.add_argument("--repeat", type=int, default=3, help="report the best wall time of this many runs")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak-memory run")
+    parser.add_argument("--label", help="version label stored with the results (default: git commit)")
+    parser.add_argument("--out", default="benchmark_results.json")
+    parser.add_argument("--compare", metavar="BASELINE_JSON", help="compare the new results with an earlier run")
+    parser.add_argument("--threshold", type=float, default=1.2)
+    parser.add_argument("--startup", action="store_true",
+                        help="only measure cold-start time and peak memory of the CLI and the full-import path")
+    args = parser.parse_args(argv)
+
+    if args.startup:
+        for r in measure_startup(repeat=args.repeat):
+            memory = f"{r['peak_mb']:.1f} MB" if r["peak_mb"] is not None else "-"
+            print(f"{r['case']:<24} {r['seconds']:.3f}s  {memory}")
+        return
+
+    def progress(r):
+        memory = f"{r['peak_mb']:.1f} MB" if r["peak_mb"] is not None else "-"
+        print(f"{r['target']:<24} staff={r['staff']:<6} weeks={r['weeks']:<3} {r['seconds']:.3f}s  {memory}  violations={r['violations']}")
+
+    report = run_suite(args.targets, args.staff, args.weeks, args.seed, not args.no_memory,
+                       args.max_cells, args.label, progress, args.repeat)
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Saved {len(report['results'])} results to {args.out}")
+
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)
+        regressions = 0
+        for row in compare(baseline, report, args.threshold):
+            flag = "  REGRESSION" if row["regression"] else ""
+            regressions += row["regression"]
+            print(f"{row['target']:<24} staff={row['staff']:<6} weeks={row['weeks']:<3} "
+                  f"{row['before']:.3f}s -> {row['after']:.3f}s (x{row['ratio']}){flag}")
+        if regressions:
+            raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
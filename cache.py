@@ -0,0 +1,143 @@
+import contextlib
+import hashlib
+import json
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from roster import RosterGenerator
+
+# Generator options that do not change the roster and so stay out of the cache key.
+NON_ROSTER_OPTIONS = ("instrument", "hooks")
+
+def _plain(value):
+    # Arrays such as a demand profile are hashed in full; str() would elide large ones.
+    return value.tolist() if hasattr(value, "tolist") else str(value)
+
+def roster_cache_key(staff_list, week_id="Week 1", carry=None, **rules):
+    # Content hash of everything that decides the generated roster. Only the requests for
+    # the week being planned are included, so edits to other weeks keep their hits.
+    rules = {key: value for key, value in rules.items() if key not in NON_ROSTER_OPTIONS}
+    staff = [
+        [s.name, s.role, list(s.availability), s.max_hours, s.min_off_days, list(s.weekly_off_requests.get(week_id, []))]
+        for s in staff_list
+    ]
+    payload = json.dumps([staff, week_id, rules], sort_keys=True, default=_plain).encode("utf-8")
+    digest = hashlib.sha256(payload)
+    for name in sorted(carry or {}):
+        digest.update(name.encode("utf-8"))
+        digest.update(carry[name].tobytes())
+    return digest.hexdigest()
+
+class RosterCache:
+    # Two tiers: an in-memory LRU of roster snapshots and, when a directory is given, pickled
+    # snapshots on disk. The disk tier drops its least recently used files once it grows
+    # past max_disk_bytes. One cache can be shared by several threads (the app keeps one per
+    # server), and several processes can share a directory, so a file that disappears
+    # between listing and reading or removing it counts as already evicted.
+    def __init__(self, max_entries=64, directory=None, max_disk_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def get(self, key):
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+            if self.directory:
+                try:
+                    with open(self._path(key), "rb") as f:
+                        snapshot = pickle.load(f)
+                except (OSError, pickle.UnpicklingError, EOFError):
+                    snapshot = None
+                if snapshot is not None:
+                    with contextlib.suppress(FileNotFoundError):
+                        os.utime(self._path(key))
+                    self.disk_hits += 1
+                    self._remember(key, snapshot)
+                    return snapshot
+            self.misses += 1
+            return None
+
+    def _remember(self, key, snapshot):
+        self.entries[key] = snapshot
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def put(self, key, snapshot):
+        with self.lock:
+            self._remember(key, snapshot)
+            if self.directory:
+                tmp = f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp, "wb") as f:
+                    pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp, self._path(key))
+                self._evict_disk()
+
+    def _remove(self, name):
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(os.path.join(self.directory, name))
+
+    def _evict_disk(self):
+        files = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".pkl"):
+                try:
+                    stat = os.stat(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in files)
+        for _, size, name in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            self._remove(name)
+            total -= size
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            if self.directory:
+                for name in os.listdir(self.directory):
+                    if name.endswith(".pkl"):
+                        self._remove(name)
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                "entries": len(self.entries),
+            }
+
+    def generate(self, staff_list, week_id="Week 1", carry=None, **rules):
+        # Returns a generated RosterGenerator, running the scheduler only on a cache miss.
+        # Staff start the week with a clean schedule either way, so cached and fresh runs match.
+        for s in staff_list:
+            s.schedule = {}
+            s.total_hours = 0
+        planner = RosterGenerator(staff_list, **rules)
+        key = roster_cache_key(staff_list, week_id, carry, **rules)
+        snapshot = self.get(key)
+        if snapshot is not None:
+            planner.restore(snapshot)
+        else:
+            planner.generate_codes(week_id, carry=carry)
+            self.put(key, planner.snapshot())
+        return planner
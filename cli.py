@@ -0,0 +1,119 @@
+import argparse
+import json
+import sys
+from roster import ALL_DAYS, DAY_INDEX, SHIFT_NAMES, RosterGenerator
+
+# Headless entry point for cron jobs and batch workers. Only the scheduling core (numpy)
+# loads up front: openpyxl or pyarrow are imported by the exporter that needs them, and
+# neither pandas nor Streamlit is touched on the generate / validate path.
+
+def _rule(text):
+    key, sep, value = text.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"expected NAME=VALUE, got '{text}'")
+    try:
+        value = json.loads(value)
+    except ValueError:
+        pass
+    return key.strip().replace("-", "_"), value
+
+def _load(args):
+    if args.staff.endswith((".db", ".sqlite")):
+        from store import load_staff_from_db
+        staff_list, training_schedule = load_staff_from_db(args.staff, args.week)
+    else:
+        from utils import load_staff_from_json
+        staff_list, training_schedule = load_staff_from_json(args.staff)
+    rules = dict(args.rule or [])
+    rules.setdefault("training_schedule", training_schedule)
+    rules.setdefault("seed", args.seed)
+    if args.demand:
+        from demand import load_demand_csv
+        rules["demand"] = load_demand_csv(args.demand)
+    return staff_list, rules
+
+def check_staff(staff_list, training_schedule, week_id):
+    # Data problems that would silently change the roster, e.g. a misspelt day name.
+    issues = []
+    seen = set()
+    for s in staff_list:
+        if s.name in seen:
+            issues.append(f"Duplicate staff name: {s.name}")
+        seen.add(s.name)
+        unknown = [day for day in s.availability if day not in DAY_INDEX]
+        unknown += [day for day in s.weekly_off_requests.get(week_id, []) if day not in DAY_INDEX]
+        if unknown:
+            issues.append(f"{s.name} has unknown day names: {', '.join(map(str, unknown))}")
+        if s.min_off_days > len(ALL_DAYS):
+            issues.append(f"{s.name} needs more off-days ({s.min_off_days}) than a week has")
+    for name, sched in training_schedule.items():
+        if name not in seen:
+            issues.append(f"Training scheduled for unknown staff: {name}")
+        for day, (start, end) in sched.items():
+            if day not in DAY_INDEX:
+                issues.append(f"{name} has training on unknown day: {day}")
+            elif end <= start:
+                issues.append(f"{name} has training ending before it starts ({day})")
+    return issues
+
+def _table(planner):
+    width = max([len("Staff")] + [len(s.name) for s in planner.staff_list])
+    names = [name or "-" for name in SHIFT_NAMES]
+    lines = [f"{'Staff':<{width}}  " + "  ".join(f"{day[:3]:<9}" for day in ALL_DAYS)]
+    for s, codes in zip(planner.staff_list, planner.codes.tolist()):
+        lines.append(f"{s.name:<{width}}  " + "  ".join(f"{names[code]:<9}" for code in codes))
+    return "\n".join(line.rstrip() for line in lines)
+
+def _result(planner, issues):
+    return {
+        "week_id": planner.week_id,
+        "roster": {s.name: [SHIFT_NAMES[code] for code in codes]
+                   for s, codes in zip(planner.staff_list, planner.codes.tolist())},
+        "hours": {s.name: round(h, 1) for s, h in zip(planner.staff_list, (planner.hours + planner.training_hours).tolist())},
+        "data_issues": issues,
+        "violations": list(planner.list_violations()),
+        "training_conflicts": planner.training_conflicts(),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate, validate and export weekly rosters without the GUI.")
+    parser.add_argument("command", choices=["generate", "validate"],
+                        help="generate prints the roster; validate prints only the problems and exits 1 if there are any")
+    parser.add_argument("--staff", default="staff_data.json", help="staff .json file or SQLite .db store")
+    parser.add_argument("--week", default="Week 1")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--rule", type=_rule, action="append", metavar="NAME=VALUE",
+                        help="RosterGenerator option, e.g. --rule min_staff_weekday=4 (repeatable)")
+    parser.add_argument("--demand", help="traffic forecast CSV for 15-minute coverage")
+    parser.add_argument("--export", help="write the roster to .xlsx, .csv or .parquet")
+    parser.add_argument("--json", action="store_true", help="print the result as JSON")
+    args = parser.parse_args(argv)
+
+    staff_list, rules = _load(args)
+    issues = check_staff(staff_list, rules["training_schedule"], args.week)
+    planner = RosterGenerator(staff_list, **rules)
+    planner.generate_codes(args.week)
+    if args.export:
+        from export import export_rosters
+        export_rosters([(args.week, planner)], args.export)
+
+    result = _result(planner, issues)
+    problems = result["data_issues"] + result["violations"]
+    if args.json:
+        if args.command == "validate":
+            result.pop("roster")
+        json.dump(result, sys.stdout, indent=2)
+        print()
+    else:
+        if args.command == "generate":
+            print(f"{args.week}\n{_table(planner)}\n")
+        for issue in problems:
+            print(f"- {issue}")
+        if args.export:
+            print(f"Saved {args.export}")
+    if args.command == "validate" and problems:
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
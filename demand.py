@@ -0,0 +1,127 @@
+import csv
+import io
+import numpy as np
+from roster import ALL_DAYS, DAY_INDEX, SHIFT_NAMES, MORNING, AFTERNOON, _minutes as _clock_minutes
+
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+FILL_CODES = (MORNING, AFTERNOON)
+DEMAND_COLUMNS = ("Day", "Start", "Required")
+
+def _minutes(value):
+    # roster's parser plus a range check, since forecast rows are typed by hand; 24:00 is
+    # allowed as the end of the day.
+    if not isinstance(value, str):
+        return _clock_minutes(value)
+    try:
+        minutes = _clock_minutes(value.strip())
+        valid = 0 <= int(value.split(":")[1]) < 60 and 0 <= minutes <= 24 * 60
+    except ValueError:
+        valid = False
+    if not valid:
+        raise ValueError(f"invalid time '{value}'")
+    return minutes
+
+def slot_range(start, end):
+    # Slots touched by [start, end); a shift ending at 10:20 still covers the 10:15 slot.
+    first = _minutes(start) // SLOT_MINUTES
+    last = -(-_minutes(end) // SLOT_MINUTES)
+    return first, max(first, min(last, SLOTS_PER_DAY))
+
+def slot_label(slot):
+    return f"{slot * SLOT_MINUTES // 60:02d}:{slot * SLOT_MINUTES % 60:02d}"
+
+def _day(raw):
+    raw = (raw or "").strip()
+    if raw.isdigit() and 1 <= int(raw) <= 7:
+        return int(raw) - 1
+    for day, d in DAY_INDEX.items():
+        if day.lower() == raw.lower():
+            return d
+    raise ValueError(f"invalid day '{raw}'")
+
+def load_demand_csv(source):
+    # Traffic forecast with Day (name or 1-7), Start, optional End and Required columns, one
+    # row per interval; without End a row covers one slot. Overlapping rows keep the larger
+    # headcount. Returns a days x slots array of the staff needed on the floor.
+    if isinstance(source, str):
+        text = open(source, "r", encoding="utf-8-sig", newline="")
+    elif isinstance(source, io.TextIOBase):
+        text = source
+    else:
+        text = io.TextIOWrapper(source, encoding="utf-8-sig", newline="")
+    demand = np.zeros((len(ALL_DAYS), SLOTS_PER_DAY), dtype=int)
+    try:
+        reader = csv.DictReader(text)
+        missing = [c for c in DEMAND_COLUMNS if c not in (reader.fieldnames or [])]
+        if missing:
+            raise ValueError(f"Demand CSV is missing required columns: {', '.join(missing)}")
+        for row in reader:
+            try:
+                d = _day(row["Day"])
+                start = row["Start"]
+                end = row.get("End") or slot_label(_minutes(start) // SLOT_MINUTES + 1)
+                first, last = slot_range(start, end)
+                required = int(np.ceil(float(row["Required"])))
+            except (ValueError, TypeError, AttributeError) as e:
+                raise ValueError(f"Demand CSV line {reader.line_num}: {e}") from None
+            demand[d, first:last] = np.maximum(demand[d, first:last], required)
+    finally:
+        if isinstance(source, str):
+            text.close()
+        elif text is not source:
+            text.detach()
+    return demand
+
+class CoverageModel:
+    # Turns shift codes into 15-minute coverage curves. Each shift code gets a difference
+    # array (+1 at its first slot, -1 after its last), so a day's curve is the running sum
+    # of the per-code headcounts times those steps. Training sessions are added as fixed
+    # intervals, since the people attending are in the store.
+    def __init__(self, shift_times, demand=None, training=()):
+        self.steps = np.zeros((len(SHIFT_NAMES), SLOTS_PER_DAY + 1), dtype=int)
+        for code, (start, end) in shift_times.items():
+            first, last = slot_range(start, end)
+            self.steps[code, first] += 1
+            self.steps[code, last] -= 1
+        self.shapes = np.cumsum(self.steps, axis=1)[:, :-1]
+        extra = np.zeros((len(ALL_DAYS), SLOTS_PER_DAY + 1), dtype=int)
+        for d, start, end in training:
+            first, last = slot_range(start, end)
+            extra[d, first] += 1
+            extra[d, last] -= 1
+        self.extra = np.cumsum(extra, axis=1)[:, :-1]
+        self.demand = None if demand is None else np.asarray(demand, dtype=int).reshape(len(ALL_DAYS), SLOTS_PER_DAY)
+        self.fillable = self.shapes[list(FILL_CODES)].any(axis=0)
+
+    def curves(self, stack):
+        # (candidates x staff x days) codes -> (candidates x days x slots) people on the floor.
+        stack = np.asarray(stack)
+        if stack.ndim == 2:
+            stack = stack[None]
+        counts = np.stack([(stack == code).sum(axis=1) for code in range(len(SHIFT_NAMES))], axis=-1)
+        return np.cumsum(counts @ self.steps, axis=-1)[..., :-1] + self.extra
+
+    def day_curve(self, column, d):
+        counts = np.bincount(np.asarray(column, dtype=np.intp), minlength=len(SHIFT_NAMES))
+        return np.cumsum(counts @ self.steps)[:-1] + self.extra[d]
+
+    def deficit(self, stack):
+        return np.maximum(self.demand - self.curves(stack), 0)
+
+    def gaps(self, codes):
+        # Runs of consecutive short slots per day as (day, first slot, end slot, need, have).
+        cover = self.curves(codes)[0]
+        short = np.zeros((len(ALL_DAYS), SLOTS_PER_DAY + 2), dtype=np.int8)
+        short[:, 1:-1] = self.demand > cover
+        edges = np.diff(short, axis=1)
+        result = []
+        for d in range(len(ALL_DAYS)):
+            for first, last in zip(np.flatnonzero(edges[d] == 1), np.flatnonzero(edges[d] == -1)):
+                result.append((ALL_DAYS[d], int(first), int(last),
+                               int(self.demand[d, first:last].max()), int(cover[d, first:last].min())))
+        return result
+
+    def describe(self, codes):
+        return [f"Coverage short on {day} {slot_label(first)}–{slot_label(last)} (need {need}, have {have})"
+                for day, first, last, need, have in self.gaps(codes)]
@@ -0,0 +1,51 @@
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+class Diagnostics:
+    # Collects what a RosterGenerator run did: seconds per phase, counters such as candidates
+    # considered / rejected per rule and sort or selection operations, and fallback events.
+    # Hooks are called as hook(kind, payload) for every phase and event as it happens.
+    def __init__(self, hooks=None):
+        self.hooks = list(hooks or [])
+        self.reset()
+
+    def reset(self):
+        self.phases = defaultdict(float)
+        self.counters = defaultdict(int)
+        self.events = []
+
+    def emit(self, kind, payload):
+        for hook in self.hooks:
+            hook(kind, payload)
+
+    @contextmanager
+    def phase(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - started
+            self.phases[name] += seconds
+            self.emit("phase", {"name": name, "seconds": seconds})
+
+    def count(self, key, n=1):
+        self.counters[key] += int(n)
+
+    def event(self, kind, **detail):
+        self.events.append({"kind": kind, **detail})
+        self.emit(kind, detail)
+
+    def merge(self, report):
+        for name, seconds in report["phases"].items():
+            self.phases[name] += seconds
+        for key, n in report["counters"].items():
+            self.counters[key] += n
+        self.events.extend(report["events"])
+
+    def report(self):
+        return {
+            "phases": dict(self.phases),
+            "counters": dict(sorted(self.counters.items())),
+            "events": list(self.events),
+        }
@@ -0,0 +1,116 @@
+import numpy as np
+from roster import ALL_DAYS, WEEKENDS, SHIFT_NAMES, OFF, IN_CHARGE, CLOSING, RosterGenerator
+
+VIOLATION_WEIGHT = 100
+
+DAY_RULES = {
+    "unavailable": "scheduled on unavailable day",
+    "requested_off": "scheduled on requested off-day",
+    "consecutive_closing": "closing on consecutive days",
+    "consecutive_incharge": "In-Charge on consecutive days",
+    "training_conflict": "scheduled over training",
+}
+STAFF_RULES = {
+    "max_hours": "exceeds max hours",
+    "min_off_days": "has fewer than the minimum off-days",
+    "max_closing": "exceeds max closings per week",
+    "max_incharge": "exceeds max In-Charge per week",
+}
+
+class RosterEvaluator:
+    # Scores rosters after the fact. Rosters are (candidates x staff x days) arrays of the
+    # shift codes from roster.py; every rule is checked for the whole stack at once.
+    def __init__(self, planner, week_id):
+        staff = planner.staff_list
+        n = len(staff)
+        self.names = [s.name for s in staff]
+        self.shift_hours = planner.shift_hours
+        self.available = planner.available
+        self.requested = np.array([[day in s.weekly_off_requests.get(week_id, []) for day in ALL_DAYS] for s in staff],
+                                  dtype=bool).reshape(n, len(ALL_DAYS)) & planner.available
+        self.weekend = np.array([day in WEEKENDS for day in ALL_DAYS])
+        self.required = np.where(self.weekend, planner.min_weekend, planner.min_weekday)
+        self.max_hours = np.array([s.max_hours for s in staff], dtype=float)
+        self.min_off = np.array([s.min_off_days for s in staff])
+        self.last_day = planner.carry["last_day"]
+        self.is_late = np.zeros(len(SHIFT_NAMES), dtype=bool)
+        self.is_late[planner.late_codes] = True
+        self.non_consecutive_closing = planner.enforce_non_consecutive_closing
+        self.non_consecutive_incharge = planner.enforce_non_consecutive_incharge
+        self.max_closing = planner.max_closing_per_week
+        self.max_incharge = planner.max_incharge_per_week
+        self.coverage = planner.coverage
+        self.training_hours = planner.training_hours
+        self.training_clash = planner.training_clash if planner.training_clash.any() else None
+
+    @classmethod
+    def for_staff(cls, staff_list, week_id="Week 1", **rules):
+        return cls(RosterGenerator(staff_list, **rules), week_id)
+
+    def _masks(self, stack):
+        working = stack > OFF
+        incharge = stack == IN_CHARGE
+        closing = stack == CLOSING
+        previous = np.concatenate([np.broadcast_to(self.last_day, stack.shape[:2])[:, :, None], stack[:, :, :-1]], axis=2)
+        shortfall = np.maximum(self.required - working.sum(axis=1), 0)
+        masks = {
+            "min_staff_weekday": np.where(self.weekend, 0, shortfall),
+            "min_staff_weekend": np.where(self.weekend, shortfall, 0),
+            "no_incharge": ~incharge.any(axis=1),
+            "no_closing": ~closing.any(axis=1),
+            "unavailable": working & ~self.available,
+            "requested_off": working & self.requested,
+            "max_hours": self.shift_hours[stack].sum(axis=2) + self.training_hours > self.max_hours,
+            "min_off_days": (stack == OFF).sum(axis=2) < self.min_off,
+        }
+        if self.non_consecutive_closing:
+            masks["consecutive_closing"] = closing & self.is_late[previous]
+        if self.non_consecutive_incharge:
+            masks["consecutive_incharge"] = incharge & (previous == IN_CHARGE)
+        if self.max_closing:
+            masks["max_closing"] = closing.sum(axis=2) > self.max_closing
+        if self.max_incharge:
+            masks["max_incharge"] = incharge.sum(axis=2) > self.max_incharge
+        if self.training_clash is not None:
+            n, days = stack.shape[1:]
+            masks["training_conflict"] = self.training_clash[np.arange(n)[:, None], np.arange(days), stack]
+        if self.coverage is not None:
+            # One violation per short 15-minute slot.
+            masks["coverage"] = self.coverage.deficit(stack) > 0
+        return masks
+
+    def evaluate(self, stack):
+        stack = np.asarray(stack)
+        if stack.ndim == 2:
+            stack = stack[None]
+        counts = {rule: mask.reshape(len(stack), -1).sum(axis=1) for rule, mask in self._masks(stack).items()}
+        counts["total"] = sum(counts.values())
+        return counts
+
+    def score(self, stack):
+        stack = np.asarray(stack)
+        if stack.ndim == 2:
+            stack = stack[None]
+        penalty = VIOLATION_WEIGHT * self.evaluate(stack)["total"].astype(float)
+        if not stack.shape[1]:
+            return penalty
+        closings = (stack == CLOSING).sum(axis=2)
+        hours = self.shift_hours[stack].sum(axis=2)
+        return penalty + hours.var(axis=1) + closings.max(axis=1) - closings.min(axis=1)
+
+    def describe(self, codes):
+        masks = {rule: mask[0] for rule, mask in self._masks(np.asarray(codes)[None]).items()}
+        staffed = (np.asarray(codes) > OFF).sum(axis=0)
+        issues = [f"No In-Charge assigned on {ALL_DAYS[d]}" for d in np.flatnonzero(masks["no_incharge"])]
+        issues += [f"No Closing assigned on {ALL_DAYS[d]}" for d in np.flatnonzero(masks["no_closing"])]
+        for d in np.flatnonzero(masks["min_staff_weekday"] + masks["min_staff_weekend"]):
+            issues.append(f"Understaffed on {ALL_DAYS[d]} ({staffed[d]}/{self.required[d]})")
+        for rule, text in DAY_RULES.items():
+            for i, d in zip(*np.nonzero(masks.get(rule, ()))):
+                issues.append(f"{self.names[i]} {text} ({ALL_DAYS[d]})")
+        for rule, text in STAFF_RULES.items():
+            for i in np.flatnonzero(masks.get(rule, ())):
+                issues.append(f"{self.names[i]} {text}")
+        if self.coverage is not None:
+            issues += self.coverage.describe(codes)
+        return issues
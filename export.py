@@ -0,0 +1,97 @@
+import csv
+import re
+from roster import ALL_DAYS, SHIFT_NAMES, UNASSIGNED
+
+FILL_COLORS = {
+    "Morning": "ADD8E6",
+    "Afternoon": "F5DEB3",
+    "In-Charge": "FFA500",
+    "Closing": "87CEEB",
+    "Training": "90EE90",
+    "OFF": "D3D3D3"
+}
+
+# Every exporter takes a list of (title, planner) pairs for generated RosterGenerators,
+# e.g. one per store or per week, and reads the shift codes directly.
+
+def _labels(planner):
+    return ["" if code == UNASSIGNED else label for code, label in enumerate(planner.shift_labels.tolist())]
+
+def _sheet_titles(titles):
+    seen = set()
+    for title in titles:
+        base = re.sub(r"[\[\]:*?/\\]", "-", str(title))[:31] or "Roster"
+        name, k = base, 1
+        while name.lower() in seen:
+            k += 1
+            suffix = f" ({k})"
+            name = base[:31 - len(suffix)] + suffix
+        seen.add(name.lower())
+        yield name
+
+def export_excel(sheets, filename="weekly_roster.xlsx"):
+    # Write-only workbook: rows go straight to disk and each cell gets its fill as it is
+    # written. The fills are built once and shared; openpyxl interns the resulting style,
+    # so every cell of a shift points at the same workbook style.
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import PatternFill
+
+    sheets = list(sheets)
+    wb = Workbook(write_only=True)
+    fills = {label: PatternFill(start_color=color, end_color=color, fill_type="solid") for label, color in FILL_COLORS.items()}
+    code_fills = [fills.get(name) for name in SHIFT_NAMES]
+
+    for title, (_, planner) in zip(_sheet_titles(t for t, _ in sheets), sheets):
+        ws = wb.create_sheet(title)
+        labels = _labels(planner)
+        ws.append(["Activity"] + [planner.activities.get(day, "—") for day in ALL_DAYS])
+        ws.append(["Staff"] + ALL_DAYS)
+        for s, codes in zip(planner.staff_list, planner.codes.tolist()):
+            row = [s.name]
+            for code in codes:
+                if code_fills[code] is None:
+                    row.append(labels[code])
+                else:
+                    cell = WriteOnlyCell(ws, value=labels[code])
+                    cell.fill = code_fills[code]
+                    row.append(cell)
+            ws.append(row)
+    if not sheets:
+        wb.create_sheet("Roster")
+    wb.save(filename)
+
+def export_csv(sheets, filename="weekly_roster.csv"):
+    with open(filename, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Sheet", "Staff"] + ALL_DAYS)
+        for title, planner in sheets:
+            labels = _labels(planner)
+            writer.writerows([title, s.name] + [labels[code] for code in codes]
+                             for s, codes in zip(planner.staff_list, planner.codes.tolist()))
+
+def export_parquet(sheets, filename="weekly_roster.parquet"):
+    # Needs pyarrow. Day columns are dictionary-encoded straight from the code matrix, and
+    # each sheet is written as its own row group.
+    import numpy as np
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    day_type = pa.dictionary(pa.int8(), pa.string())
+    schema = pa.schema([("Sheet", pa.string()), ("Staff", pa.string())] + [(day, day_type) for day in ALL_DAYS])
+    with pq.ParquetWriter(filename, schema) as writer:
+        for title, planner in sheets:
+            n = len(planner.staff_list)
+            labels = pa.array(_labels(planner), type=pa.string())
+            codes = np.ascontiguousarray(planner.codes.T)
+            columns = [pa.array([title] * n, type=pa.string()), pa.array([s.name for s in planner.staff_list], type=pa.string())]
+            columns += [pa.DictionaryArray.from_arrays(pa.array(codes[d], type=pa.int8()), labels) for d in range(len(ALL_DAYS))]
+            writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+
+EXPORTERS = {".xlsx": export_excel, ".csv": export_csv, ".parquet": export_parquet}
+
+def export_rosters(sheets, filename):
+    for suffix, exporter in EXPORTERS.items():
+        if filename.lower().endswith(suffix):
+            return exporter(sheets, filename)
+    raise ValueError(f"Unsupported export format for {filename}; use one of {', '.join(EXPORTERS)}")
@@ -0,0 +1,60 @@
+from roster import RosterGenerator
+
+def consecutive_weeks(first_week, count):
+    return [f"Week {first_week + k}" for k in range(count)]
+
+class RosterHorizon:
+    # Plans a run of consecutive weeks. Closing / In-Charge counts, hours and the last
+    # day's shift are carried from one week into the next, so fairness and the
+    # non-consecutive rules hold across week boundaries.
+    def __init__(self, staff_list, **rules):
+        self.staff_list = staff_list
+        self.rules = rules
+        self.weeks = []
+
+    def _plan_week(self, week_id, carry):
+        for s in self.staff_list:
+            s.schedule = {}
+            s.total_hours = 0
+        planner = RosterGenerator(self.staff_list, **self.rules)
+        planner.generate_codes(week_id, carry=carry)
+        return week_id, planner
+
+    def generate(self, week_ids):
+        self.weeks = []
+        carry = None
+        for week_id in week_ids:
+            self.weeks.append(self._plan_week(week_id, carry))
+            carry = self.weeks[-1][1].carry_out()
+        return self.rosters()
+
+    def roll_forward(self, week_id):
+        # Drop the oldest week and plan only the new tail week; the weeks in between are kept.
+        # The dropped week's totals leave the fairness window either way; with a single week
+        # only its last day is kept for Monday's previous-day rules.
+        _, dropped = self.weeks.pop(0)
+        carry = (self.weeks[-1][1] if self.weeks else dropped).carry_out()
+        for key, value in dropped.week_totals().items():
+            carry[key] = carry[key] - value
+        self.weeks.append(self._plan_week(week_id, carry))
+        return self.weeks[-1][1].roster
+
+    @property
+    def carry(self):
+        return self.weeks[-1][1].carry_out() if self.weeks else None
+
+    def rosters(self):
+        return {week_id: planner.roster for week_id, planner in self.weeks}
+
+    def summary(self):
+        import pandas as pd
+        frames = [planner.summary().assign(Week=week_id) for week_id, planner in self.weeks]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    def list_violations(self):
+        return [f"{week_id}: {issue}" for week_id, planner in self.weeks for issue in planner.list_violations()]
+
+    def export(self, filename):
+        # One sheet (or row group) per week; the format follows the file extension.
+        from export import export_rosters
+        export_rosters(self.weeks, filename)
@@ -0,0 +1,101 @@
+import csv
+import io
+import time
+from roster import ALL_DAYS
+
+REQUIRED_COLUMNS = ("Staff Name", "Week", "Requested Off Days")
+MAX_REPORTED_REJECTS = 1000
+
+def _open_text(source):
+    if isinstance(source, str):
+        return open(source, "r", encoding="utf-8-sig", newline="", buffering=1 << 20)
+    if isinstance(source, io.TextIOBase):
+        return source
+    return io.TextIOWrapper(source, encoding="utf-8-sig", newline="")
+
+def _parse_days(raw):
+    days = []
+    for token in (raw or "").split(","):
+        token = token.strip()
+        if not token:
+            continue
+        if not token.isdigit() or not 1 <= int(token) <= 7:
+            raise ValueError(f"invalid day number '{token}' (expected 1-7)")
+        day = ALL_DAYS[int(token) - 1]
+        if day not in days:
+            days.append(day)
+    return days
+
+def ingest_weekly_requests_csv(source, staff_list=None, db_file=None, batch_size=5000):
+    # Streams an off-day request export row by row and writes accepted rows in batches to
+    # the staff objects and/or the SQLite store, so memory use does not grow with file size.
+    # Each accepted row replaces that staff member's requests for its week.
+    if staff_list is None and db_file is None:
+        raise ValueError("Give staff_list, db_file or both as the ingest target")
+    by_name = {s.name: s for s in staff_list} if staff_list is not None else None
+    if db_file is not None:
+        from store import staff_names, upsert_offday_requests
+        known = staff_names(db_file)
+    else:
+        known = set(by_name)
+
+    report = {"rows": 0, "accepted": 0, "rejected": 0, "rejects": [], "batches": 0}
+    batch = []
+
+    def flush():
+        if not batch:
+            return
+        if by_name is not None:
+            for name, week, days in batch:
+                if name in by_name:
+                    by_name[name].weekly_off_requests[week] = days
+        if db_file is not None:
+            upsert_offday_requests(batch, db_file)
+        report["batches"] += 1
+        batch.clear()
+
+    def reject(line, reason, row):
+        report["rejected"] += 1
+        if len(report["rejects"]) < MAX_REPORTED_REJECTS:
+            report["rejects"].append({"line": line, "reason": reason, "row": row})
+
+    started = time.perf_counter()
+    text = _open_text(source)
+    try:
+        reader = csv.DictReader(text)
+        missing = [c for c in REQUIRED_COLUMNS if c not in (reader.fieldnames or [])]
+        if missing:
+            raise ValueError(f"CSV is missing required columns: {', '.join(missing)}")
+        for row in reader:
+            report["rows"] += 1
+            line = reader.line_num
+            name = (row.get("Staff Name") or "").strip()
+            week = (row.get("Week") or "").strip()
+            if not name:
+                reject(line, "missing staff name", row)
+                continue
+            if not week:
+                reject(line, "missing week", row)
+                continue
+            if name not in known:
+                reject(line, f"unknown staff '{name}'", row)
+                continue
+            try:
+                days = _parse_days(row.get("Requested Off Days"))
+            except ValueError as e:
+                reject(line, str(e), row)
+                continue
+            batch.append((name, week, days))
+            report["accepted"] += 1
+            if len(batch) >= batch_size:
+                flush()
+        flush()
+    finally:
+        if isinstance(source, str):
+            text.close()
+        elif text is not source:
+            text.detach()
+
+    report["seconds"] = time.perf_counter() - started
+    report["rows_per_second"] = report["rows"] / report["seconds"] if report["seconds"] else 0.0
+    return report
@@ -0,0 +1,46 @@
+import bisect
+
+class IntervalIndex:
+    # Sorted, non-overlapping [start, end) intervals in minutes of the day, kept per key such
+    # as (staff index, day index), each with a label. Because the intervals never overlap,
+    # their ends are sorted too, so one bisect on the starts finds the only interval that
+    # can overlap a candidate: O(log n) in the intervals that key holds.
+    def __init__(self):
+        self.starts = {}
+        self.ends = {}
+        self.labels = {}
+
+    def overlapping(self, key, start, end):
+        # Returns (label, start, end) of an interval overlapping [start, end), or None.
+        starts = self.starts.get(key)
+        if not starts or start >= end:
+            return None
+        k = bisect.bisect_left(starts, end)
+        if k and self.ends[key][k - 1] > start:
+            return self.labels[key][k - 1], starts[k - 1], self.ends[key][k - 1]
+        return None
+
+    def add(self, key, start, end, label):
+        # Inserts the interval unless it overlaps one already held; the overlapping interval
+        # is returned in that case and the index is left unchanged.
+        if start >= end:
+            return None
+        hit = self.overlapping(key, start, end)
+        if hit:
+            return hit
+        starts = self.starts.setdefault(key, [])
+        k = bisect.bisect_left(starts, start)
+        starts.insert(k, start)
+        self.ends.setdefault(key, []).insert(k, end)
+        self.labels.setdefault(key, []).insert(k, label)
+        return None
+
+    def intervals(self, key):
+        return list(zip(self.labels.get(key, ()), self.starts.get(key, ()), self.ends.get(key, ())))
+
+    def copy(self):
+        index = IntervalIndex()
+        index.starts = {key: list(v) for key, v in self.starts.items()}
+        index.ends = {key: list(v) for key, v in self.ends.items()}
+        index.labels = {key: list(v) for key, v in self.labels.items()}
+        return index
@@ -1,24 +1,54 @@
+import numpy as np
 import pandas as pd
-from roster import ALL_DAYS
+from roster import ALL_DAYS, day_mask
+
+OFFDAY_STATUSES = ["🛌 Requested", "✅ Available", "🚫 Unavailable"]
+REQUESTED, AVAILABLE, UNAVAILABLE = range(len(OFFDAY_STATUSES))
+STATUS_SYMBOLS = np.array([status.split()[0] for status in OFFDAY_STATUSES], dtype=object)
+
+class OffdayCalendar:
+    # Off-day status for every staff member, week and day as one int8 (staff x week x day)
+    # array of OFFDAY_STATUSES positions. Requests are read once into a day bitmask per
+    # staff and week, and the status array is then built from the bitmasks in one pass.
+    def __init__(self, staff_list, week_ids):
+        self.names = [s.name for s in staff_list]
+        self.week_ids = list(week_ids)
+        n, weeks = len(self.names), len(self.week_ids)
+        position = {week: k for k, week in enumerate(self.week_ids)}
+        requested = np.zeros((n, weeks), dtype=np.int64)
+        for i, s in enumerate(staff_list):
+            for week, days in s.weekly_off_requests.items():
+                k = position.get(week)
+                if k is not None:
+                    requested[i, k] = day_mask(days)
+        available = np.array([s.availability_mask for s in staff_list], dtype=np.int64).reshape(n, 1, 1)
+        bits = 1 << np.arange(len(ALL_DAYS))
+        self.status = np.where(requested[:, :, None] & bits, REQUESTED,
+                               np.where(available & bits, AVAILABLE, UNAVAILABLE)).astype(np.int8)
+
+    def counts(self, status=AVAILABLE):
+        # Staff per week and day with the given status, e.g. how many could be rostered.
+        return pd.DataFrame((self.status == status).sum(axis=0), index=self.week_ids, columns=ALL_DAYS)
+
+    def week_totals(self, status=AVAILABLE):
+        return pd.Series((self.status == status).sum(axis=(0, 2)), index=self.week_ids)
+
+    def page(self, start=0, size=50, first_week=0, last_week=None):
+        # One screenful: staff rows [start, start + size) and weeks [first_week, last_week),
+        # with a status symbol per day, so only the visible cells are turned into strings.
+        rows = self.status[start:start + size, first_week:last_week]
+        weeks = self.week_ids[first_week:last_week]
+        columns = [f"{week} {day[:3]}" for week in weeks for day in ALL_DAYS]
+        return pd.DataFrame(STATUS_SYMBOLS[rows.reshape(len(rows), -1)], index=self.names[start:start + size],
+                            columns=columns)
+
+    def week_frame(self, week_id):
+        k = self.week_ids.index(week_id)
+        labels = np.array(OFFDAY_STATUSES, dtype=object)[self.status[:, k]]
+        return pd.DataFrame({"Staff": self.names, **{day: labels[:, d].tolist() for d, day in enumerate(ALL_DAYS)}})
 
 def generate_offday_matrix(staff_list, week_id):
-    matrix = {
-        "Staff": [],
-        **{day: [] for day in ALL_DAYS}
-    }
-
-    for staff in staff_list:
-        matrix["Staff"].append(staff.name)
-        requested = staff.weekly_off_requests.get(week_id, [])
-        for day in ALL_DAYS:
-            if day in requested:
-                matrix[day].append("🛌 Requested")
-            elif day not in staff.availability:
-                matrix[day].append("🚫 Unavailable")
-            else:
-                matrix[day].append("✅ Available")
-
-    return pd.DataFrame(matrix)
+    return OffdayCalendar(staff_list, [week_id]).week_frame(week_id)
 
 def update_offday_request(staff_list, staff_name, week_id, day, status):
     staff = next((s for s in staff_list if s.name == staff_name), None)
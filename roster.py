@@ -1,12 +1,41 @@
+import contextlib
+import copy
 import datetime
-import pandas as pd
+import heapq
+import numpy as np
 import random
-from collections import defaultdict
+from intervals import IntervalIndex
 
 ALL_DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
 WEEKENDS = ["Saturday", "Sunday"]
+DAY_INDEX = {day: i for i, day in enumerate(ALL_DAYS)}
+
+# Integer shift codes used for the staff x day roster matrix.
+UNASSIGNED, OFF, MORNING, AFTERNOON, IN_CHARGE, CLOSING = range(6)
+SHIFT_NAMES = ["", "OFF", "Morning", "Afternoon", "In-Charge", "Closing"]
+STORE_CLOSE = datetime.time(22, 0)
+
+def _minutes(t):
+    if isinstance(t, str):
+        hours, minutes = t.split(":")
+        return int(hours) * 60 + int(minutes)
+    return t.hour * 60 + t.minute
+
+def _clock(minutes):
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+DAY_BITS = {day: 1 << i for i, day in enumerate(ALL_DAYS)}
+
+def day_mask(days):
+    mask = 0
+    for day in days:
+        mask |= DAY_BITS.get(day, 0)
+    return mask
 
 class Staff:
+    __slots__ = ("name", "role", "_availability", "availability_mask", "max_hours", "min_off_days",
+                 "weekly_off_requests", "schedule", "total_hours")
+
     def __init__(self, name, role, availability, max_hours=9999, min_off_days=2):
         self.name = name
         self.role = role
@@ -17,14 +46,23 @@ class Staff:
         self.schedule = {}
         self.total_hours = 0
 
+    # Availability is held as a tuple so it can only change by assignment, which also
+    # rebuilds the day bitmask the scheduler reads.
+    @property
+    def availability(self):
+        return self._availability
+
+    @availability.setter
+    def availability(self, days):
+        self._availability = tuple(days)
+        self.availability_mask = day_mask(self._availability)
+
     def assign_shift(self, day, start, end, label=None):
-        duration = datetime.datetime.combine(datetime.date.today(), end) - datetime.datetime.combine(datetime.date.today(), start)
-        hours = duration.total_seconds() / 3600
         self.schedule[day] = (start, end)
-        self.total_hours += hours
+        self.total_hours += (_minutes(end) - _minutes(start)) / 60
 
     def is_available(self, day):
-        return day in self.availability and self.schedule.get(day) is None
+        return bool(self.availability_mask & DAY_BITS.get(day, 0)) and self.schedule.get(day) is None
 
 class RosterGenerator:
     def __init__(self, staff_list,
@@ -35,7 +73,13 @@ class RosterGenerator:
                  enforce_non_consecutive_incharge=True,
                  max_closing_per_week=None,
                  max_incharge_per_week=None,
-                 auto_tune_enabled=True):
+                 auto_tune_enabled=False,
+                 auto_tune_budget=2.0,
+                 auto_tune_workers=None,
+                 seed=None,
+                 instrument=False,
+                 hooks=None,
+                 demand=None):
 
         self.staff_list = staff_list
         self.opening_time = datetime.datetime.strptime(opening_hour, "%H:%M").time()
@@ -52,148 +96,461 @@ class RosterGenerator:
         self.max_closing_per_week = max_closing_per_week
         self.max_incharge_per_week = max_incharge_per_week
         self.auto_tune_enabled = auto_tune_enabled
+        self.auto_tune_budget = auto_tune_budget
+        self.auto_tune_workers = auto_tune_workers
+        self.tuning_report = None
+        self.seed = seed
+        # Off-day shuffles use their own generator when seeded, so equal inputs give equal
+        # rosters; generate_codes() derives it from the seed and the week being planned.
+        self.rng = None
+        # Diagnostics stay None unless asked for, so an uninstrumented run only pays for the
+        # `is not None` checks.
+        self.diagnostics = None
+        if instrument or hooks:
+            from diagnostics import Diagnostics
+            self.diagnostics = Diagnostics(hooks)
 
-        self.roster = pd.DataFrame(index=[s.name for s in staff_list], columns=ALL_DAYS)
+        self.shift_times = {
+            MORNING: (self.report_time, self.morning_end),
+            AFTERNOON: (self.afternoon_start, self.closing_time),
+            IN_CHARGE: (datetime.time(10, 0), STORE_CLOSE),
+            CLOSING: (self.report_time, STORE_CLOSE),
+        }
+        self.shift_hours = np.zeros(len(SHIFT_NAMES))
+        labels = [np.nan, "OFF"] + [None] * len(self.shift_times)
+        for code, (start, end) in self.shift_times.items():
+            self.shift_hours[code] = (_minutes(end) - _minutes(start)) / 60
+            labels[code] = f"{SHIFT_NAMES[code]}: {start.strftime('%H:%M')}–{end.strftime('%H:%M')}"
+        self.shift_labels = np.array(labels, dtype=object)
+        # Shifts running until the store shuts count as a close for the next day's rule.
+        self.late_codes = [code for code, (_, end) in self.shift_times.items() if end == STORE_CLOSE]
+        self.shift_minutes = {code: (_minutes(start), _minutes(end)) for code, (start, end) in self.shift_times.items()}
+        # demand is a days x 15-minute-slots array of staff needed, e.g. from
+        # demand.load_demand_csv; with it the fill pass works towards the slot deficits.
+        self.coverage = self._coverage_model(demand) if demand is not None else None
+
+        n = len(staff_list)
+        masks = np.array([s.availability_mask for s in staff_list], dtype=np.int64).reshape(n, 1)
+        self.available = (masks >> np.arange(len(ALL_DAYS)) & 1).astype(bool)
+        self.codes = np.zeros((n, len(ALL_DAYS)), dtype=np.int8)
+        self.hours = np.zeros(n)
+        self.headcount = np.full(len(ALL_DAYS), n)
+        self.carry = self._empty_carry()
+        self.week_id = None
         self.violations = []
+        self._load_training()
+        self.intervals = self.training.copy()
+
+    def _coverage_model(self, demand=None):
+        from demand import CoverageModel
+        training = [(DAY_INDEX[day], start, end) for s in self.staff_list
+                    for day, (start, end) in self.training_schedule.get(s.name, {}).items() if day in DAY_INDEX]
+        return CoverageModel(self.shift_times, demand, training)
 
     def _subtract_minutes(self, time_obj, minutes):
         return (datetime.datetime.combine(datetime.date.today(), time_obj) - datetime.timedelta(minutes=minutes)).time()
 
+    def _empty_carry(self):
+        n = len(self.staff_list)
+        return {
+            "incharge": np.zeros(n, dtype=int),
+            "closing": np.zeros(n, dtype=int),
+            "hours": np.zeros(n),
+            "last_day": np.full(n, UNASSIGNED, dtype=np.int8),
+        }
+
+    def _load_training(self):
+        # Training blocks per (staff, day) in minutes of the day. training_clash marks the
+        # (staff, day, shift code) cells whose shift would overlap a block, and training hours
+        # count towards max_hours.
+        n = len(self.staff_list)
+        self.training = IntervalIndex()
+        self.training_hours = np.zeros(n)
+        self.training_clash = np.zeros((n, len(ALL_DAYS), len(SHIFT_NAMES)), dtype=bool)
+        for i, s in enumerate(self.staff_list):
+            for day, (start, end) in self.training_schedule.get(s.name, {}).items():
+                if day not in DAY_INDEX:
+                    continue
+                d, start, end = DAY_INDEX[day], _minutes(start), _minutes(end)
+                if self.training.add((i, d), start, end, "Training") is None:
+                    self.training_hours[i] += (end - start) / 60
+                for code, (first, last) in self.shift_minutes.items():
+                    self.training_clash[i, d, code] |= first < end and start < last
+
+    def _index_shifts(self):
+        # Rebuilds the interval index from the training blocks plus every assigned shift.
+        self.intervals = self.training.copy()
+        for i, d in zip(*np.nonzero(self.codes > OFF)):
+            code = int(self.codes[i, d])
+            self.intervals.add((int(i), int(d)), *self.shift_minutes[code], SHIFT_NAMES[code])
+
+    def _fits(self, i, d, code):
+        return self.intervals.overlapping((int(i), d), *self.shift_minutes[code]) is None
+
+    def _previous_codes(self, d):
+        return self.codes[:, d - 1] if d > 0 else self.carry["last_day"]
+
+    def _load_staff_state(self):
+        by_times = {times: code for code, times in self.shift_times.items()}
+        for i, s in enumerate(self.staff_list):
+            for day, slot in s.schedule.items():
+                if day in DAY_INDEX:
+                    self.codes[i, DAY_INDEX[day]] = OFF if slot is None else by_times.get(slot, MORNING)
+            self.hours[i] = s.total_hours
+        self.headcount = (self.codes != OFF).sum(axis=0)
+        self._index_shifts()
+
+    def _is_available(self, d):
+        return self.available[:, d] & (self.codes[:, d] <= OFF)
+
+    def _phase(self, name):
+        return self.diagnostics.phase(name) if self.diagnostics is not None else contextlib.nullcontext()
+
+    def _assign(self, i, d, code):
+        if self.codes[i, d] == OFF:
+            self.headcount[d] += 1
+        self.codes[i, d] = code
+        self.hours[i] += self.shift_hours[code]
+        self.intervals.add((int(i), d), *self.shift_minutes[code], SHIFT_NAMES[code])
+        start, end = self.shift_times[code]
+        self.staff_list[i].assign_shift(ALL_DAYS[d], start, end, SHIFT_NAMES[code])
+
+    def _mark_off(self, i, d):
+        if self.codes[i, d] != OFF:
+            self.headcount[d] -= 1
+        self.codes[i, d] = OFF
+        self.staff_list[i].schedule[ALL_DAYS[d]] = None
+
     def assign_off_days(self, week_id):
-        for staff in self.staff_list:
+        for i, staff in enumerate(self.staff_list):
+            free = self.available[i] & (self.codes[i] == UNASSIGNED)
             requested = staff.weekly_off_requests.get(week_id, [])
-            scheduled = list(staff.schedule.keys())
-            selected = [d for d in requested if d in staff.availability and d not in scheduled]
+            selected = [d for d in requested if d in DAY_INDEX and free[DAY_INDEX[d]]]
             remaining = staff.min_off_days - len(selected)
-            fillable = [d for d in ALL_DAYS if d in staff.availability and d not in scheduled and d not in selected]
-            random.shuffle(fillable)
+            fillable = [d for d in ALL_DAYS if free[DAY_INDEX[d]] and d not in selected]
+            (self.rng or random).shuffle(fillable)
             selected += fillable[:remaining]
             for day in selected:
-                staff.schedule[day] = None
-                self.roster.at[staff.name, day] = "OFF"
+                self._mark_off(i, DAY_INDEX[day])
 
-    def assign_daily_in_charge(self):
-        tracker = defaultdict(int)
-        for i, day in enumerate(ALL_DAYS):
-            prev = ALL_DAYS[i - 1] if i > 0 else None
-            eligible = []
-            for s in self.staff_list:
-                had_prev = prev in s.schedule and isinstance(s.schedule[prev], str) and "In-Charge" in s.schedule[prev]
-                if self.enforce_non_consecutive_incharge and had_prev:
-                    continue
-                if self.max_incharge_per_week and tracker[s.name] >= self.max_incharge_per_week:
-                    continue
-                if s.is_available(day):
-                    eligible.append(s)
-            if eligible:
-                s = sorted(eligible, key=lambda x: tracker[x.name])[0]
-                s.assign_shift(day, datetime.time(10, 0), datetime.time(22, 0), "In-Charge")
-                self.roster.at[s.name, day] = "In-Charge: 10:00–22:00"
-                tracker[s.name] += 1
+    def _rejection(self, i, d, code, tracker, carried, blocked, cap):
+        if not self.available[i, d] or self.codes[i, d] > OFF:
+            return "busy_or_unavailable"
+        if not self._fits(i, d, code):
+            return "training"
+        if blocked and (self.codes[i, d - 1] if d > 0 else self.carry["last_day"][i]) in blocked:
+            return "consecutive"
+        if cap and tracker[i] - carried[i] >= cap:
+            return "weekly_cap"
+        return None
+
+    def _pick_least_used(self, phase, code, heap, d, tracker, carried, blocked, cap):
+        # heap holds (assignments so far, staff index), so the first entry that passes the rules
+        # is the least-used eligible person with ties going to the earlier staff member. Entries
+        # whose count no longer matches the tracker are stale and dropped; people who fail a
+        # rule today are pushed back for the following days.
+        skipped = []
+        chosen = None
+        while heap:
+            count, i = heapq.heappop(heap)
+            if count != tracker[i]:
+                continue
+            reason = self._rejection(i, d, code, tracker, carried, blocked, cap)
+            if self.diagnostics is not None:
+                self.diagnostics.count(f"{phase}.considered")
+                if reason:
+                    self.diagnostics.count(f"{phase}.rejected.{reason}")
+            if reason is None:
+                chosen = i
+                break
+            skipped.append((count, i))
+        for entry in skipped:
+            heapq.heappush(heap, entry)
+        if self.diagnostics is not None:
+            self.diagnostics.count("selections")
+        return chosen
+
+    def _assign_daily(self, phase, code, carried, blocked, cap, shift):
+        carried = carried.tolist()
+        tracker = list(carried)
+        heap = [(count, i) for i, count in enumerate(tracker)]
+        heapq.heapify(heap)
+        for d, day in enumerate(ALL_DAYS):
+            i = self._pick_least_used(phase, code, heap, d, tracker, carried, blocked, cap)
+            if i is not None:
+                self._assign(i, d, code)
+                tracker[i] += 1
+                heapq.heappush(heap, (tracker[i], i))
             else:
-                self.violations.append(f"No In-Charge assigned on {day}")
+                self._uncovered(shift, day)
+
+    def _uncovered(self, shift, day):
+        self.violations.append(f"No {shift} assigned on {day}")
+        if self.diagnostics is not None:
+            self.diagnostics.event("uncovered", shift=shift, day=day)
+
+    def assign_daily_in_charge(self):
+        blocked = [IN_CHARGE] if self.enforce_non_consecutive_incharge else None
+        self._assign_daily("in_charge", IN_CHARGE, self.carry["incharge"], blocked, self.max_incharge_per_week, "In-Charge")
 
     def assign_closing_staff(self):
-        tracker = defaultdict(int)
-        for i, day in enumerate(ALL_DAYS):
-            prev = ALL_DAYS[i - 1] if i > 0 else None
-            eligible = []
-            for s in self.staff_list:
-                closed_prev = prev in s.schedule and isinstance(s.schedule[prev], tuple) and s.schedule[prev][1] == datetime.time(22, 0)
-                if self.enforce_non_consecutive_closing and closed_prev:
-                    continue
-                if self.max_closing_per_week and tracker[s.name] >= self.max_closing_per_week:
-                    continue
-                if s.is_available(day):
-                    eligible.append(s)
-            if eligible:
-                s = sorted(eligible, key=lambda x: tracker[x.name])[0]
-                s.assign_shift(day, self.report_time, datetime.time(22, 0), "Closing")
-                self.roster.at[s.name, day] = f"Closing: {self.report_time.strftime('%H:%M')}–22:00"
-                tracker[s.name] += 1
-            else:
-                self.violations.append(f"No Closing assigned on {day}")
+        blocked = self.late_codes if self.enforce_non_consecutive_closing else None
+        self._assign_daily("closing", CLOSING, self.carry["closing"], blocked, self.max_closing_per_week, "Closing")
 
     def fill_remaining_shifts(self, day, required_count, shift_tracker):
-        current = sum(1 for s in self.staff_list if self.roster.at[s.name, day] not in ["OFF", None])
-        shortfall = max(0, required_count - current)
-        eligible = [s for s in self.staff_list if s.is_available(day)]
+        d = DAY_INDEX[day]
+        eligible = np.flatnonzero(self._is_available(d))
+        hours = self.carry["hours"][eligible] + self.hours[eligible]
+        if self.diagnostics is not None:
+            self.diagnostics.count("fill.considered", len(eligible))
+            self.diagnostics.count("sorts")
+        order = eligible[np.argsort(hours, kind="stable")]
+        # Days without a forecast fall back to the plain headcount fill.
+        if self.coverage is not None and self.coverage.demand[d].any():
+            self._fill_to_demand(d, order, shift_tracker, required_count)
+            return
         morning_given = False
         afternoon_given = False
-        for s in sorted(eligible, key=lambda x: x.total_hours):
-            name = s.name
-            if shift_tracker[name]["Morning"] == 0 and not morning_given:
-                s.assign_shift(day, self.report_time, self.morning_end, "Morning")
-                self.roster.at[name, day] = f"Morning: {self.report_time.strftime('%H:%M')}–{self.morning_end.strftime('%H:%M')}"
-                shift_tracker[name]["Morning"] += 1
+        for i in order:
+            if shift_tracker[MORNING][i] == 0 and not morning_given and self._fits(i, d, MORNING):
+                self._assign(i, d, MORNING)
+                shift_tracker[MORNING][i] += 1
                 morning_given = True
-            elif shift_tracker[name]["Afternoon"] == 0 and not afternoon_given:
-                s.assign_shift(day, self.afternoon_start, self.closing_time, "Afternoon")
-                self.roster.at[name, day] = f"Afternoon: {self.afternoon_start.strftime('%H:%M')}–{self.closing_time.strftime('%H:%M')}"
-                shift_tracker[name]["Afternoon"] += 1
+            elif shift_tracker[AFTERNOON][i] == 0 and not afternoon_given and self._fits(i, d, AFTERNOON):
+                self._assign(i, d, AFTERNOON)
+                shift_tracker[AFTERNOON][i] += 1
                 afternoon_given = True
-            current = sum(1 for s in self.staff_list if self.roster.at[s.name, day] not in ["OFF", None])
-            if current >= required_count:
+            if self.headcount[d] >= required_count:
+                break
+
+    def _fill_to_demand(self, d, order, shift_tracker, required_count):
+        # Walks the least-worked people first and gives each the Morning or Afternoon shift that
+        # covers the slot with the largest deficit, preferring the one that clears more of the
+        # remaining shortfall and skipping shifts that would take someone past max_hours
+        # (training included) or overlap their training. Once the deficit is cleared it keeps
+        # filling until the number of people working reaches the minimum staff rule. Unlike the
+        # plain fill it only hands out cells that are still unassigned, so OFF days stay off and
+        # the floor counts real shifts rather than the unassigned cells in headcount.
+        model = self.coverage
+        need = np.where(model.fillable, model.demand[d] - model.day_curve(self.codes[:, d], d), 0)
+        working = int((self.codes[:, d] > OFF).sum())
+        for i in order[self.codes[order, d] == UNASSIGNED]:
+            short = need.max() > 0
+            if not short and working >= required_count:
                 break
+            targets = [code for code in shift_tracker if model.shapes[code, int(np.argmax(need))]] if short else list(shift_tracker)
+            room = self.staff_list[i].max_hours - self.carry["hours"][i] - self.hours[i] - self.training_hours[i]
+            options = [code for code in targets if self.shift_hours[code] <= room and self._fits(i, d, code)]
+            if not options:
+                continue
+            code = max(options, key=lambda c: np.maximum(need, 0)[model.shapes[c] > 0].sum())
+            self._assign(i, d, code)
+            shift_tracker[code][i] += 1
+            need -= model.shapes[code]
+            working += 1
+
+    def generate(self, week_id="Week 1", carry=None):
+        self.generate_codes(week_id, carry)
+        return self.roster
 
-    def generate(self, week_id="Week 1"):
-        shift_tracker = {s.name: {"Morning": 0, "Afternoon": 0} for s in self.staff_list}
-        self.assign_off_days(week_id)
-        self.assign_daily_in_charge()
-        self.assign_closing_staff()
-        for day in ALL_DAYS:
-            required = self.min_weekend if day in WEEKENDS else self.min_weekday
-            self.fill_remaining_shifts(day, required, shift_tracker)
-        for s in self.staff_list:
+    def generate_codes(self, week_id="Week 1", carry=None):
+        # Same as generate() but returns the shift code matrix, so callers that do not need
+        # the DataFrame never import pandas. carry is the state returned by carry_out() for
+        # the previous week; it seeds the fairness counters and the previous-day rules for Monday.
+        if self.auto_tune_enabled:
+            from autotune import auto_tune
+            template = copy.copy(self)
+            template.diagnostics = None
+            template = copy.deepcopy(template)
+            template.auto_tune_enabled = False
+        if self.diagnostics is not None:
+            self.diagnostics.reset()
+        self.week_id = week_id
+        self.carry = {key: value.copy() for key, value in carry.items()} if carry else self._empty_carry()
+        if self.seed is not None:
+            # One stream per week, so a seeded horizon does not repeat its off-day draws.
+            self.rng = random.Random(f"{self.seed}:{week_id}")
+        self._load_staff_state()
+        n = len(self.staff_list)
+        shift_tracker = {MORNING: np.zeros(n, dtype=int), AFTERNOON: np.zeros(n, dtype=int)}
+        with self._phase("assign_off_days"):
+            self.assign_off_days(week_id)
+        with self._phase("assign_daily_in_charge"):
+            self.assign_daily_in_charge()
+        with self._phase("assign_closing_staff"):
+            self.assign_closing_staff()
+        with self._phase("fill_remaining_shifts"):
             for day in ALL_DAYS:
-                if day not in s.schedule:
-                    s.schedule[day] = None
-                    self.roster.at[s.name, day] = "OFF"
-                    self.violations.append(f"{s.name} auto-marked OFF on {day}")
+                required = self.min_weekend if day in WEEKENDS else self.min_weekday
+                self.fill_remaining_shifts(day, required, shift_tracker)
+        for i, d in zip(*np.nonzero(self.codes == UNASSIGNED)):
+            self._mark_off(i, d)
+            self.violations.append(f"{self.staff_list[i].name} auto-marked OFF on {ALL_DAYS[d]}")
+            if self.diagnostics is not None:
+                self.diagnostics.event("auto_off", staff=self.staff_list[i].name, day=ALL_DAYS[d])
+        self.violations += [f"{c['staff']} scheduled over training ({c['day']})" for c in self.training_conflicts()]
+        if self.coverage is not None:
+            self.violations += self.coverage.describe(self.codes)
+        if self.auto_tune_enabled:
+            with self._phase("auto_tune"):
+                self.tuning_report = auto_tune(self, template, week_id, carry)
+        return self.codes
+
+    def diagnostics_report(self):
+        return self.diagnostics.report() if self.diagnostics is not None else None
+
+    def apply_codes(self, codes, violations):
+        # Replace this week's shifts with another roster for the same team, e.g. a tuned one.
+        codes = np.asarray(codes, dtype=np.int8)
+        delta = self.shift_hours[codes].sum(axis=1) - self.shift_hours[self.codes].sum(axis=1)
+        self.codes = codes.copy()
+        self.hours = self.hours + delta
+        self.headcount = (self.codes != OFF).sum(axis=0)
+        self._index_shifts()
+        for s, row, extra in zip(self.staff_list, self.codes, delta.tolist()):
+            for day, code in zip(ALL_DAYS, row):
+                if code != UNASSIGNED:
+                    s.schedule[day] = self.shift_times.get(code)
+            s.total_hours += extra
+        self.violations = list(violations)
+
+    def _best_cover(self, evaluator, codes, d, shifts, skip=None):
+        # Tries giving each eligible person one of `shifts` on day d, or moving their Morning /
+        # Afternoon shift over from the day before or after, and keeps the best scoring roster.
+        # The unchanged roster goes first so ties keep the fewest edits.
+        candidates = [codes]
+        open_day = self.available[:, d] & ~evaluator.requested[:, d]
+        holders = (OFF,) if shifts == (MORNING, AFTERNOON) else (OFF, MORNING, AFTERNOON)
+        for j in np.flatnonzero(open_day & np.isin(codes[:, d], holders)):
+            if j == skip:
+                continue
+            for code in shifts:
+                candidate = codes.copy()
+                candidate[j, d] = code
+                candidates.append(candidate)
+        for nb in (d - 1, d + 1):
+            if not 0 <= nb < len(ALL_DAYS):
+                continue
+            for j in np.flatnonzero(open_day & (codes[:, d] == OFF) & np.isin(codes[:, nb], shifts)):
+                if j == skip:
+                    continue
+                candidate = codes.copy()
+                candidate[j, d], candidate[j, nb] = codes[j, nb], OFF
+                candidates.append(candidate)
+        scores = evaluator.score(np.stack(candidates))
+        return candidates[int(np.argmin(scores))]
+
+    def repair(self, staff_name, week_id, day, status):
+        # Applies one off-day request change to the generated week and patches that day only.
+        # Candidates are scored on the whole week, so the previous and next day's closing and
+        # In-Charge rules still apply. Returns the changed cells as (staff, day, old, new).
+        from evaluator import RosterEvaluator
+        from offday_calendar import OFFDAY_STATUSES, update_offday_request
+
+        if week_id != self.week_id:
+            raise ValueError(f"Roster was generated for {self.week_id}, not {week_id}")
+        i = next((k for k, s in enumerate(self.staff_list) if s.name == staff_name), None)
+        if i is None:
+            raise ValueError(f"Unknown staff member: {staff_name}")
+        if day not in DAY_INDEX:
+            raise ValueError(f"Unknown day: {day}")
+        if status not in OFFDAY_STATUSES[:2]:
+            raise ValueError(f"Off-day status must be one of {', '.join(OFFDAY_STATUSES[:2])}, not {status}")
+        update_offday_request(self.staff_list, staff_name, week_id, day, status)
+
+        d = DAY_INDEX[day]
+        evaluator = RosterEvaluator(self, week_id)
+        codes = self.codes.copy()
+        # Only a shift taken away needs covering; any other edit leaves the roster as it is.
+        if status == "🛌 Requested" and codes[i, d] > OFF:
+            lost = codes[i, d]
+            codes[i, d] = OFF
+            if lost in (IN_CHARGE, CLOSING):
+                codes = self._best_cover(evaluator, codes, d, (lost,), skip=i)
+            codes = self._best_cover(evaluator, codes, d, (MORNING, AFTERNOON))
+
+        changed = [(self.staff_list[k].name, ALL_DAYS[c], self.shift_labels[self.codes[k, c]], self.shift_labels[codes[k, c]])
+                   for k, c in zip(*np.nonzero(codes != self.codes))]
+        self.apply_codes(codes, evaluator.describe(codes))
+        return changed
+
+    def snapshot(self):
+        return {
+            "week_id": self.week_id,
+            "carry": {key: value.copy() for key, value in self.carry.items()},
+            "codes": self.codes.copy(),
+            "violations": list(self.violations),
+            "tuning_report": self.tuning_report,
+            "diagnostics": self.diagnostics_report(),
+        }
+
+    def restore(self, snapshot):
+        # Rebuilds a generated week from snapshot() without running the scheduler.
+        self.week_id = snapshot["week_id"]
+        self.carry = {key: value.copy() for key, value in snapshot["carry"].items()}
+        self._load_staff_state()
+        self.apply_codes(snapshot["codes"], snapshot["violations"])
+        self.tuning_report = snapshot["tuning_report"]
+        if self.diagnostics is not None:
+            self.diagnostics.reset()
+            if snapshot.get("diagnostics"):
+                self.diagnostics.merge(snapshot["diagnostics"])
+            self.diagnostics.event("cache_hit", week_id=self.week_id)
         return self.roster
 
+    def training_conflicts(self):
+        # Shifts in the current roster that overlap a training block, one dict per cell.
+        clash = self.training_clash[np.arange(len(self.staff_list))[:, None], np.arange(len(ALL_DAYS)), self.codes]
+        conflicts = []
+        for i, d in zip(*np.nonzero(clash)):
+            code = int(self.codes[i, d])
+            start, end = self.shift_minutes[code]
+            for _, first, last in self.training.intervals((int(i), int(d))):
+                if first < end and start < last:
+                    conflicts.append({
+                        "staff": self.staff_list[i].name,
+                        "day": ALL_DAYS[d],
+                        "shift": SHIFT_NAMES[code],
+                        "shift_time": f"{_clock(start)}–{_clock(end)}",
+                        "training": f"{_clock(first)}–{_clock(last)}",
+                    })
+        return conflicts
+
+    def coverage_curves(self):
+        # People on the floor per day and 15-minute slot for the current roster.
+        return (self.coverage or self._coverage_model()).curves(self.codes)[0]
+
+    def week_totals(self):
+        return {
+            "incharge": (self.codes == IN_CHARGE).sum(axis=1),
+            "closing": (self.codes == CLOSING).sum(axis=1),
+            "hours": self.shift_hours[self.codes].sum(axis=1),
+        }
+
+    def carry_out(self):
+        totals = self.week_totals()
+        carry = {key: self.carry[key] + totals[key] for key in totals}
+        carry["last_day"] = self.codes[:, -1].copy()
+        return carry
+
+    @property
+    def roster(self):
+        import pandas as pd
+        return pd.DataFrame(self.shift_labels[self.codes], index=[s.name for s in self.staff_list],
+                            columns=ALL_DAYS, dtype=object)
+
     def summary(self):
+        import pandas as pd
         return pd.DataFrame({
             "Staff": [s.name for s in self.staff_list],
-            "Total Hours": [round(s.total_hours, 1) for s in self.staff_list],
-            "Scheduled Days": [len([d for d, v in s.schedule.items() if v]) for s in self.staff_list],
-            "Off-Days": [len([d for d, v in s.schedule.items() if v is None]) for s in self.staff_list]
+            "Total Hours": [round(h, 1) for h in (self.hours + self.training_hours).tolist()],
+            "Scheduled Days": (self.codes > OFF).sum(axis=1),
+            "Off-Days": (self.codes == OFF).sum(axis=1)
         })
 
     def list_violations(self):
         return self.violations
 
     def export_to_excel(self, filename="weekly_roster.xlsx"):
-        from openpyxl import Workbook
-        from openpyxl.styles import PatternFill
-
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Roster"
-
-        ws.append(["Activity"] + [self.activities.get(day, "—") for day in ALL_DAYS])
-        ws.append(["Staff"] + ALL_DAYS)
-
-        for s in self.staff_list:
-            row = [s.name]
-            for day in ALL_DAYS:
-                row.append(self.roster.at[s.name, day] or "")
-            ws.append(row)
-        fill_colors = {
-            "Morning": "ADD8E6",
-            "Afternoon": "F5DEB3",
-            "In-Charge": "FFA500",
-            "Closing": "87CEEB",
-            "Training": "90EE90",
-            "OFF": "D3D3D3"
-        }
-
-        for row in ws.iter_rows(min_row=3, min_col=2):
-            for cell in row:
-                value = cell.value or ""
-                for label, color in fill_colors.items():
-                    if label in value or value == label:
-                        cell.fill = PatternFill(start_color=color, end_color=color, fill_type="solid")
-
-        wb.save(filename)
-
+        from export import export_excel
+        export_excel([("Roster", self)], filename)
@@ -0,0 +1,150 @@
+import datetime
+import sqlite3
+from roster import Staff, _minutes
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS staff (
+    name TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    role TEXT NOT NULL,
+    availability TEXT NOT NULL,
+    max_hours REAL NOT NULL,
+    min_off_days INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS offday_requests (
+    staff TEXT NOT NULL REFERENCES staff(name) ON DELETE CASCADE,
+    week TEXT NOT NULL,
+    days TEXT NOT NULL,
+    PRIMARY KEY (staff, week)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS offday_requests_week ON offday_requests (week, staff);
+CREATE TABLE IF NOT EXISTS training (
+    staff TEXT NOT NULL,
+    day TEXT NOT NULL,
+    start_minute INTEGER NOT NULL,
+    end_minute INTEGER NOT NULL,
+    PRIMARY KEY (staff, day)
+) WITHOUT ROWID;
+"""
+
+def connect(filename="staff_data.db"):
+    # WAL lets several Streamlit sessions read while one of them writes.
+    conn = sqlite3.connect(filename, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    conn.executescript(SCHEMA)
+    return conn
+
+def _days(text):
+    return text.split(",") if text else []
+
+def _time(minutes):
+    return datetime.time(minutes // 60, minutes % 60)
+
+def _write_staff(conn, staff_list, training_schedule):
+    conn.executemany(
+        "INSERT INTO staff (name, position, role, availability, max_hours, min_off_days) VALUES (?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT(name) DO UPDATE SET position=excluded.position, role=excluded.role, "
+        "availability=excluded.availability, max_hours=excluded.max_hours, min_off_days=excluded.min_off_days",
+        [(s.name, i, s.role, ",".join(s.availability), s.max_hours, s.min_off_days) for i, s in enumerate(staff_list)]
+    )
+    names = [s.name for s in staff_list]
+    conn.execute(f"DELETE FROM staff WHERE name NOT IN ({','.join('?' * len(names))})", names)
+    # Only the weeks present in memory are written, so staff loaded for a single week keep
+    # the rest of their request history.
+    for s in staff_list:
+        for week, days in s.weekly_off_requests.items():
+            _write_request(conn, s.name, week, days)
+    conn.execute("DELETE FROM training")
+    conn.executemany(
+        "INSERT INTO training (staff, day, start_minute, end_minute) VALUES (?, ?, ?, ?)",
+        [(name, day, _minutes(times[0]), _minutes(times[1]))
+         for name, sched in training_schedule.items() for day, times in sched.items()]
+    )
+
+def _write_request(conn, staff_name, week_id, days):
+    _write_requests(conn, [(staff_name, week_id, days)])
+
+def _write_requests(conn, rows):
+    conn.executemany(
+        "INSERT INTO offday_requests (staff, week, days) VALUES (?, ?, ?) "
+        "ON CONFLICT(staff, week) DO UPDATE SET days=excluded.days",
+        [(name, week, ",".join(days)) for name, week, days in rows if days]
+    )
+    conn.executemany(
+        "DELETE FROM offday_requests WHERE staff = ? AND week = ?",
+        [(name, week) for name, week, days in rows if not days]
+    )
+
+def save_staff_to_db(staff_list, training_schedule, filename="staff_data.db"):
+    conn = connect(filename)
+    try:
+        with conn:
+            _write_staff(conn, staff_list, training_schedule)
+    finally:
+        conn.close()
+
+def load_staff_from_db(filename="staff_data.db", week_id=None):
+    # With week_id only that week's off-day requests are read.
+    conn = connect(filename)
+    try:
+        staff_list = []
+        by_name = {}
+        for name, role, availability, max_hours, min_off_days in conn.execute(
+                "SELECT name, role, availability, max_hours, min_off_days FROM staff ORDER BY position"):
+            staff = Staff(name=name, role=role, availability=_days(availability),
+                          max_hours=int(max_hours) if max_hours == int(max_hours) else max_hours,
+                          min_off_days=min_off_days)
+            staff_list.append(staff)
+            by_name[name] = staff
+
+        if week_id is None:
+            rows = conn.execute("SELECT staff, week, days FROM offday_requests")
+        else:
+            rows = conn.execute("SELECT staff, week, days FROM offday_requests WHERE week = ?", (week_id,))
+        for name, week, days in rows:
+            if name in by_name:
+                by_name[name].weekly_off_requests[week] = _days(days)
+
+        training_schedule = {}
+        for name, day, start, end in conn.execute("SELECT staff, day, start_minute, end_minute FROM training"):
+            training_schedule.setdefault(name, {})[day] = (_time(start), _time(end))
+    finally:
+        conn.close()
+    return staff_list, training_schedule
+
+def upsert_offday_request(staff_name, week_id, days, filename="staff_data.db"):
+    conn = connect(filename)
+    try:
+        with conn:
+            _write_request(conn, staff_name, week_id, days)
+    finally:
+        conn.close()
+
+def upsert_offday_requests(rows, filename="staff_data.db"):
+    # rows are (staff name, week, days) tuples, written in a single transaction.
+    conn = connect(filename)
+    try:
+        with conn:
+            _write_requests(conn, rows)
+    finally:
+        conn.close()
+
+def staff_names(filename="staff_data.db"):
+    conn = connect(filename)
+    try:
+        return {name for (name,) in conn.execute("SELECT name FROM staff")}
+    finally:
+        conn.close()
+
+def import_staff_json(json_file="staff_data.json", filename="staff_data.db"):
+    from utils import load_staff_from_json
+    staff_list, training_schedule = load_staff_from_json(json_file)
+    save_staff_to_db(staff_list, training_schedule, filename)
+    return len(staff_list)
+
+if __name__ == "__main__":
+    import sys
+    source = sys.argv[1] if len(sys.argv) > 1 else "staff_data.json"
+    target = sys.argv[2] if len(sys.argv) > 2 else "staff_data.db"
+    print(f"Imported {import_staff_json(source, target)} staff from {source} into {target}")
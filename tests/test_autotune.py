@@ -0,0 +1,35 @@
+import random
+import numpy as np
+import pytest
+from autotune import local_search
+from benchmark import synthetic_team
+from evaluator import RosterEvaluator
+from roster import OFF, RosterGenerator
+
+@pytest.mark.parametrize("seed", range(4))
+def test_tuned_roster_never_scores_worse_than_greedy(seed):
+    greedy = RosterGenerator(synthetic_team(15, 1, seed=seed), seed=seed)
+    greedy.generate_codes()
+    tuned = RosterGenerator(synthetic_team(15, 1, seed=seed), seed=seed, auto_tune_enabled=True,
+                            auto_tune_budget=0.2, auto_tune_workers=1)
+    tuned.generate_codes()
+    report = tuned.tuning_report
+    evaluator = RosterEvaluator(tuned, "Week 1")
+    assert report["greedy_score"] == pytest.approx(float(evaluator.score(greedy.codes)[0]))
+    assert float(evaluator.score(tuned.codes)[0]) == pytest.approx(report["best_score"])
+    assert report["best_score"] <= report["greedy_score"]
+    assert report["improvement"] >= 0
+    if report["best_seed"] is not None:
+        assert tuned.list_violations() == evaluator.describe(tuned.codes)
+    assert (tuned.hours == tuned.shift_hours[tuned.codes].sum(axis=1)).all()
+
+def test_local_search_keeps_availability():
+    planner = RosterGenerator(synthetic_team(10, 1, seed=5), seed=5)
+    planner.generate_codes()
+    evaluator = RosterEvaluator(planner, "Week 1")
+    start = float(evaluator.score(planner.codes)[0])
+    codes, score = local_search(evaluator, planner.codes, random.Random(0), deadline=float("inf"))
+    assert score <= start
+    assert score == pytest.approx(float(evaluator.score(codes)[0]))
+    assert not ((codes > OFF) & ~planner.available).any()
+    assert not np.shares_memory(codes, planner.codes)
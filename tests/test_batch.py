@@ -0,0 +1,35 @@
+from batch import combine_violations, generate_batch, run_job
+from benchmark import synthetic_team
+from utils import save_staff_to_json
+
+def jobs(tmp_path):
+    paths = []
+    for n, size in enumerate((12, 25)):
+        path = str(tmp_path / f"store{n}.json")
+        save_staff_to_json(synthetic_team(size, 2, seed=n), {}, path)
+        paths.append(path)
+    return [
+        {"staff_file": paths[0], "week_id": "Week 1", "seed": 1},
+        {"staff_file": paths[1], "week_id": "Week 2", "seed": 2, "rules": {"min_staff_weekday": 4}},
+        {"staff_file": paths[0], "week_id": "Week 2", "seed": 3, "store": "North"},
+    ]
+
+def _state(result):
+    return result["store"], result["week_id"], result["planner"].codes.tolist(), result["violations"]
+
+def test_pool_matches_running_each_job_alone(tmp_path):
+    batch = jobs(tmp_path)
+    alone = [_state(run_job(job)) for job in batch]
+    assert [_state(r) for r in generate_batch(batch, max_workers=2)] == alone
+    assert [_state(r) for r in generate_batch(batch, max_workers=1)] == alone
+    assert [r[0] for r in alone] == ["store0", "store1", "North"]
+
+def test_jobs_do_not_share_staff(tmp_path):
+    results = generate_batch(jobs(tmp_path), max_workers=1)
+    first, third = results[0]["planner"].staff_list, results[2]["planner"].staff_list
+    assert all(a is not b for a, b in zip(first, third))
+    # The same store planned for another week starts from a clean schedule.
+    assert sum(s.total_hours for s in first) == results[0]["planner"].hours.sum()
+    assert all((store, week) in {("store0", "Week 1"), ("store1", "Week 2"), ("North", "Week 2")}
+               for store, week, _ in combine_violations(results))
+    assert generate_batch([]) == []
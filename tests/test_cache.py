@@ -0,0 +1,89 @@
+import os
+import threading
+import cache
+from benchmark import synthetic_team
+from cache import RosterCache, roster_cache_key
+from horizon import RosterHorizon, consecutive_weeks
+from roster import OFF, RosterGenerator
+
+RULES = dict(min_staff_weekday=4, max_closing_per_week=2, seed=3)
+
+def _state(planner):
+    return planner.codes.tolist(), list(planner.list_violations()), planner.summary().values.tolist()
+
+def test_hit_restores_the_generated_week():
+    team = synthetic_team(40, 1, seed=1)
+    cache = RosterCache(max_entries=4)
+    fresh = _state(cache.generate(team, "Week 1", **RULES))
+    cached = cache.generate(team, "Week 1", **RULES)
+    assert cache.stats()["hits"] == 1
+    assert _state(cached) == fresh
+    assert [s.schedule for s in team] == [s.schedule for s in cached.staff_list]
+
+def test_disk_tier_survives_a_new_cache(tmp_path):
+    team = synthetic_team(20, 1, seed=2)
+    fresh = _state(RosterCache(directory=str(tmp_path)).generate(team, "Week 1", **RULES))
+    cache = RosterCache(directory=str(tmp_path))
+    assert _state(cache.generate(team, "Week 1", **RULES)) == fresh
+    assert cache.stats()["disk_hits"] == 1
+
+def test_key_follows_roster_inputs_only():
+    team = synthetic_team(10, 2, seed=4)
+    key = roster_cache_key(team, "Week 1", **RULES)
+    assert roster_cache_key(team, "Week 1", instrument=True, **RULES) == key
+    assert roster_cache_key(team, "Week 2", **RULES) != key
+    team[0].weekly_off_requests["Week 9"] = ["Monday"]
+    assert roster_cache_key(team, "Week 1", **RULES) == key
+    team[0].weekly_off_requests["Week 1"] = ["Sunday"]
+    assert roster_cache_key(team, "Week 1", **RULES) != key
+
+def test_seeded_generation_is_reproducible():
+    rosters = []
+    for _ in range(2):
+        planner = RosterGenerator(synthetic_team(30, 1, seed=5), seed=11)
+        rosters.append(planner.generate_codes().tolist())
+    assert rosters[0] == rosters[1]
+
+def test_seeded_horizon_draws_new_off_days_each_week():
+    horizon = RosterHorizon(synthetic_team(20, 13, seed=0, request_density=0), seed=7)
+    horizon.generate(consecutive_weeks(1, 13))
+    off_days = {(planner.codes == OFF).tobytes() for _, planner in horizon.weeks}
+    assert len(off_days) > 1
+
+def test_threads_can_share_one_cache(tmp_path):
+    shared = RosterCache(max_entries=3, directory=str(tmp_path), max_disk_bytes=200)
+    errors = []
+
+    def work(offset):
+        try:
+            for k in range(300):
+                key = str((k + offset) % 10)
+                if shared.get(key) is None:
+                    shared.put(key, {"key": key})
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=work, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    stats = shared.stats()
+    assert stats["hits"] + stats["disk_hits"] + stats["misses"] == 8 * 300
+    assert stats["entries"] <= 3
+
+def test_files_removed_elsewhere_count_as_evicted(tmp_path, monkeypatch):
+    first, second = RosterCache(directory=str(tmp_path)), RosterCache(directory=str(tmp_path))
+    first.put("a", {"week_id": "Week 1"})
+    assert second.get("a") == {"week_id": "Week 1"}
+    first.clear()
+    second.entries.clear()
+    assert second.get("a") is None
+    # Another process removes a file between the directory listing and the stat / remove.
+    listdir = os.listdir
+    monkeypatch.setattr(cache.os, "listdir", lambda path: listdir(path) + ["gone.pkl"])
+    second.max_disk_bytes = 0
+    second.put("b", {"week_id": "Week 1"})
+    second.clear()
+    assert listdir(str(tmp_path)) == []
@@ -0,0 +1,44 @@
+import json
+import os
+import subprocess
+import sys
+import pytest
+from cli import main
+from roster import ALL_DAYS, Staff
+from utils import save_staff_to_json
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STAFF = os.path.join(ROOT, "staff_data.json")
+
+def test_exit_codes(capsys):
+    # generate reports problems but still succeeds; validate fails on them.
+    assert main(["generate", "--staff", STAFF, "--seed", "1"]) == 0
+    assert capsys.readouterr().out.startswith("Week 1\nStaff")
+    assert main(["validate", "--staff", STAFF, "--seed", "1"]) == 1
+    with pytest.raises(SystemExit) as exit_info:
+        main(["publish", "--staff", STAFF])
+    assert exit_info.value.code == 2
+    with pytest.raises(SystemExit) as exit_info:
+        main(["generate", "--staff", STAFF, "--rule", "min_staff_weekday"])
+    assert exit_info.value.code == 2
+
+def test_json_output_and_data_issues(tmp_path, capsys):
+    staff = str(tmp_path / "staff.json")
+    team = [Staff("Ann", "Crew", ALL_DAYS), Staff("Ann", "Crew", ["Monday", "Funday"], min_off_days=8)]
+    save_staff_to_json(team, {}, staff)
+    assert main(["validate", "--staff", staff, "--json", "--rule", "min_staff_weekday=1"]) == 1
+    result = json.loads(capsys.readouterr().out)
+    assert "roster" not in result
+    assert result["data_issues"] == [
+        "Duplicate staff name: Ann",
+        "Ann has unknown day names: Funday",
+        "Ann needs more off-days (8) than a week has",
+    ]
+    assert main(["generate", "--staff", staff, "--json"]) == 0
+    assert len(json.loads(capsys.readouterr().out)["roster"]["Ann"]) == len(ALL_DAYS)
+
+def test_generate_path_does_not_import_pandas(tmp_path):
+    code = ("import sys, cli; status = cli.main(['generate', '--staff', sys.argv[1], '--seed', '1', '--export', sys.argv[2]]); "
+            "assert status == 0; assert 'pandas' not in sys.modules and 'streamlit' not in sys.modules")
+    subprocess.run([sys.executable, "-c", code, STAFF, str(tmp_path / "r.csv")], cwd=ROOT, check=True, capture_output=True)
+    assert (tmp_path / "r.csv").exists()
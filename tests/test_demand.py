@@ -0,0 +1,35 @@
+import io
+import numpy as np
+import pytest
+from benchmark import synthetic_team
+from demand import SLOTS_PER_DAY, load_demand_csv
+from roster import ALL_DAYS, AFTERNOON, MORNING, OFF, RosterGenerator
+
+FORECAST = "Day,Start,End,Required\nMonday,12:00,14:00,2\n"
+
+def test_forecast_rows_become_slot_demand():
+    demand = load_demand_csv(io.StringIO("Day,Start,End,Required\n1,10:00,10:20,2\nMonday,10:15,,3\n7,23:45,24:00,1.2\n"))
+    assert demand.shape == (len(ALL_DAYS), SLOTS_PER_DAY)
+    assert demand[0, 40:42].tolist() == [2, 3]
+    assert demand[0].sum() == 5
+    assert demand[6, -1] == 2
+    with pytest.raises(ValueError, match="line 2"):
+        load_demand_csv(io.StringIO("Day,Start,Required\nMonday,10:75,1\n"))
+
+@pytest.mark.parametrize("seed", range(5))
+def test_forecast_keeps_the_minimum_staff_floor(seed):
+    planner = RosterGenerator(synthetic_team(20, 1, seed=seed), seed=1, min_staff_weekday=6,
+                              demand=load_demand_csv(io.StringIO(FORECAST)))
+    planner.generate_codes()
+    assert (planner.codes > OFF).sum(axis=0)[0] >= 6
+    assert not any(v.startswith("Coverage short") for v in planner.list_violations())
+
+@pytest.mark.parametrize("seed", range(5))
+def test_demand_fill_leaves_off_days_alone(seed):
+    team = synthetic_team(20, 1, seed=seed, request_density=0)
+    for s in team:
+        s.weekly_off_requests = {"Week 1": ["Monday"]} if int(s.name[-2:]) % 2 else {}
+    planner = RosterGenerator(team, seed=1, min_staff_weekday=6, demand=load_demand_csv(io.StringIO(FORECAST)))
+    planner.generate_codes()
+    requested = np.array([bool(s.weekly_off_requests.get("Week 1")) for s in team])
+    assert not np.isin(planner.codes[requested, 0], (MORNING, AFTERNOON)).any()
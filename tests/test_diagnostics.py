@@ -0,0 +1,38 @@
+from benchmark import synthetic_team
+from roster import RosterGenerator
+
+PHASES = ["assign_off_days", "assign_daily_in_charge", "assign_closing_staff", "fill_remaining_shifts"]
+
+def test_hooks_see_every_phase_and_event():
+    calls = []
+    planner = RosterGenerator(synthetic_team(6, 1, seed=3), seed=3, min_staff_weekday=6,
+                              hooks=[lambda kind, payload: calls.append((kind, payload))])
+    planner.generate_codes()
+    report = planner.diagnostics_report()
+    assert [payload["name"] for kind, payload in calls if kind == "phase"] == PHASES
+    assert list(report["phases"]) == PHASES
+    events = [(kind, payload) for kind, payload in calls if kind != "phase"]
+    assert [(e["kind"], {k: v for k, v in e.items() if k != "kind"}) for e in report["events"]] == events
+    auto_off = [f"{e['staff']} auto-marked OFF on {e['day']}" for e in report["events"] if e["kind"] == "auto_off"]
+    assert auto_off == [v for v in planner.list_violations() if "auto-marked OFF" in v]
+
+def test_counters_follow_the_selections():
+    planner = RosterGenerator(synthetic_team(20, 1, seed=1), seed=1, instrument=True)
+    planner.generate_codes()
+    counters = planner.diagnostics_report()["counters"]
+    # One In-Charge and one Closing pick per day, and one fill sort per day.
+    assert counters["selections"] == 14
+    assert counters["sorts"] == 7
+    for phase in ("in_charge", "closing"):
+        rejected = sum(n for key, n in counters.items() if key.startswith(f"{phase}.rejected."))
+        assert counters[f"{phase}.considered"] - rejected == 7
+
+def test_instrumentation_does_not_change_the_roster():
+    runs = []
+    for options in (dict(instrument=True), dict(instrument=True), {}):
+        planner = RosterGenerator(synthetic_team(10, 1, seed=2), seed=2, **options)
+        planner.generate_codes()
+        runs.append((planner.codes.tolist(), planner.diagnostics_report()))
+    assert runs[0][0] == runs[1][0] == runs[2][0]
+    assert runs[0][1]["counters"] == runs[1][1]["counters"]
+    assert runs[2][1] is None
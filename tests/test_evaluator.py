@@ -0,0 +1,69 @@
+import datetime
+import numpy as np
+import pytest
+from evaluator import VIOLATION_WEIGHT, RosterEvaluator
+from roster import ALL_DAYS, OFF, MORNING, IN_CHARGE, CLOSING, Staff
+
+RULES = dict(min_staff_weekday=2, min_staff_weekend=2, max_closing_per_week=3)
+# One In-Charge and one Closing every day, nobody on a late shift after closing the night
+# before, at most 59 hours each and everyone's requests and availability respected.
+CLEAN = np.array([
+    [CLOSING, IN_CHARGE, OFF, CLOSING, IN_CHARGE, OFF, CLOSING],
+    [IN_CHARGE, OFF, CLOSING, IN_CHARGE, OFF, CLOSING, IN_CHARGE],
+    [OFF, CLOSING, IN_CHARGE, OFF, CLOSING, IN_CHARGE, OFF],
+    [OFF] * 7,
+], dtype=np.int8)
+
+def make_staff():
+    staff_list = [Staff(f"S{k}", "Crew", ALL_DAYS, max_hours=60, min_off_days=2) for k in range(4)]
+    staff_list[3].availability = ["Monday", "Tuesday"]
+    staff_list[3].weekly_off_requests = {"Week 1": ["Tuesday"]}
+    return staff_list
+
+def changed(*cells):
+    codes = CLEAN.copy()
+    for i, d, code in cells:
+        codes[i, d] = code
+    return codes
+
+def test_clean_roster_has_no_violations():
+    evaluator = RosterEvaluator.for_staff(make_staff(), **RULES)
+    assert evaluator.evaluate(CLEAN)["total"][0] == 0, evaluator.describe(CLEAN)
+    assert evaluator.describe(CLEAN) == []
+
+@pytest.mark.parametrize("cells, expected, issue", [
+    ([(3, 1, MORNING)], {"requested_off": 1}, "S3 scheduled on requested off-day (Tuesday)"),
+    ([(3, 2, MORNING)], {"unavailable": 1}, "S3 scheduled on unavailable day (Wednesday)"),
+    ([(0, 2, CLOSING)], {"consecutive_closing": 2, "max_closing": 1, "max_hours": 1, "min_off_days": 1},
+     "S0 closing on consecutive days (Wednesday)"),
+    ([(2, 6, IN_CHARGE)], {"consecutive_incharge": 1}, "S2 In-Charge on consecutive days (Sunday)"),
+    ([(1, 6, OFF)], {"no_incharge": 1, "min_staff_weekend": 1}, "No In-Charge assigned on Sunday"),
+    ([(0, 0, OFF)], {"no_closing": 1, "min_staff_weekday": 1}, "Understaffed on Monday (1/2)"),
+])
+def test_each_rule_counts_its_breaches(cells, expected, issue):
+    evaluator = RosterEvaluator.for_staff(make_staff(), **RULES)
+    codes = changed(*cells)
+    counts = {rule: int(n[0]) for rule, n in evaluator.evaluate(codes).items() if rule != "total" and n[0]}
+    assert counts == expected
+    assert issue in evaluator.describe(codes)
+
+def test_training_counts_towards_max_hours_and_conflicts():
+    training = {
+        "S0": {"Wednesday": (datetime.time(9, 0), datetime.time(11, 0))},
+        "S3": {"Monday": (datetime.time(10, 0), datetime.time(11, 0))},
+    }
+    evaluator = RosterEvaluator.for_staff(make_staff(), training_schedule=training, **RULES)
+    counts = evaluator.evaluate(changed((3, 0, MORNING)))
+    assert counts["max_hours"][0] == 1
+    assert counts["training_conflict"][0] == 1
+    issues = evaluator.describe(changed((3, 0, MORNING)))
+    assert "S0 exceeds max hours" in issues
+    assert "S3 scheduled over training (Monday)" in issues
+
+def test_stack_is_scored_per_candidate():
+    evaluator = RosterEvaluator.for_staff(make_staff(), **RULES)
+    # Same hours either way, so the scores differ by exactly one violation.
+    stack = np.stack([changed((3, 0, MORNING)), changed((3, 1, MORNING))])
+    assert evaluator.evaluate(stack)["total"].tolist() == [0, 1]
+    scores = evaluator.score(stack)
+    assert scores[1] - scores[0] == pytest.approx(VIOLATION_WEIGHT)
@@ -0,0 +1,60 @@
+import csv
+import pytest
+from openpyxl import Workbook, load_workbook
+from openpyxl.styles import PatternFill
+from benchmark import synthetic_team
+from export import FILL_COLORS, export_csv, export_rosters
+from roster import ALL_DAYS, RosterGenerator
+
+def planned(seed, n=15):
+    planner = RosterGenerator(synthetic_team(n, 1, seed=seed), seed=seed)
+    planner.generate_codes()
+    planner.activities = {"Monday": "Stocktake"}
+    return planner
+
+def old_workbook(planner, filename):
+    # The cell-by-cell writer export_excel replaced.
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Roster"
+    ws.append(["Activity"] + [planner.activities.get(day, "—") for day in ALL_DAYS])
+    ws.append(["Staff"] + ALL_DAYS)
+    for s in planner.staff_list:
+        ws.append([s.name] + [planner.roster.at[s.name, day] or "" for day in ALL_DAYS])
+    for row in ws.iter_rows(min_row=3, min_col=2):
+        for cell in row:
+            for label, color in FILL_COLORS.items():
+                if label in (cell.value or ""):
+                    cell.fill = PatternFill(start_color=color, end_color=color, fill_type="solid")
+    wb.save(filename)
+
+def cells(filename, sheet):
+    ws = load_workbook(filename)[sheet]
+    return [[(c.value, c.fill.fill_type, c.fill.start_color.rgb) for c in row] for row in ws.iter_rows()]
+
+@pytest.mark.parametrize("seed", range(3))
+def test_excel_matches_the_old_workbook(tmp_path, seed):
+    planner = planned(seed)
+    old, new = str(tmp_path / "old.xlsx"), str(tmp_path / "new.xlsx")
+    old_workbook(planner, old)
+    planner.export_to_excel(new)
+    assert cells(new, "Roster") == cells(old, "Roster")
+
+def test_one_sheet_per_roster_with_safe_unique_titles(tmp_path):
+    filename = str(tmp_path / "all.xlsx")
+    export_rosters([("North: Week 1", planned(0)), ("north- week 1", planned(1)), ("South/Week 1", planned(2))], filename)
+    assert load_workbook(filename).sheetnames == ["North- Week 1", "north- week 1 (2)", "South-Week 1"]
+
+def test_csv_and_parquet_hold_the_same_labels(tmp_path):
+    sheets = [("A", planned(0, 5)), ("B", planned(1, 4))]
+    export_csv(sheets, str(tmp_path / "r.csv"))
+    with open(tmp_path / "r.csv", newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    expected = [[title, s.name] + planner.roster.loc[s.name].tolist() for title, planner in sheets for s in planner.staff_list]
+    assert rows == [["Sheet", "Staff"] + ALL_DAYS] + expected
+    pq = pytest.importorskip("pyarrow.parquet")
+    export_rosters(sheets, str(tmp_path / "r.parquet"))
+    table = pq.read_table(tmp_path / "r.parquet")
+    assert [[str(v) for v in row.values()] for row in table.to_pylist()] == expected
+    with pytest.raises(ValueError, match="Unsupported"):
+        export_rosters(sheets, str(tmp_path / "r.txt"))
@@ -0,0 +1,42 @@
+import numpy as np
+from benchmark import synthetic_team
+from horizon import RosterHorizon, consecutive_weeks
+from roster import CLOSING, IN_CHARGE
+
+def test_carry_adds_up_the_planned_weeks():
+    horizon = RosterHorizon(synthetic_team(15, 4, seed=2), seed=2)
+    horizon.generate(consecutive_weeks(1, 4))
+    assert list(horizon.rosters()) == ["Week 1", "Week 2", "Week 3", "Week 4"]
+    codes = np.stack([planner.codes for _, planner in horizon.weeks])
+    carry = horizon.carry
+    assert (carry["incharge"] == (codes == IN_CHARGE).sum(axis=(0, 2))).all()
+    assert (carry["closing"] == (codes == CLOSING).sum(axis=(0, 2))).all()
+    assert (carry["last_day"] == codes[-1, :, -1]).all()
+
+def test_week_boundary_keeps_the_closing_rule():
+    horizon = RosterHorizon(synthetic_team(6, 6, seed=3, request_density=0), seed=3)
+    horizon.generate(consecutive_weeks(1, 6))
+    for (_, before), (_, after) in zip(horizon.weeks, horizon.weeks[1:]):
+        closed = np.isin(before.codes[:, -1], before.late_codes)
+        assert not (closed & (after.codes[:, 0] == CLOSING)).any()
+
+def test_roll_forward_matches_a_fresh_window():
+    horizon = RosterHorizon(synthetic_team(12, 4, seed=4), seed=4)
+    horizon.generate(consecutive_weeks(1, 3))
+    horizon.roll_forward("Week 4")
+    assert list(horizon.rosters()) == ["Week 2", "Week 3", "Week 4"]
+    carry = horizon.weeks[0][1].carry_out()
+    for key, value in horizon.weeks[1][1].carry.items():
+        assert (value == carry[key]).all()
+    totals = [planner.week_totals() for _, planner in horizon.weeks[:2]]
+    assert (horizon.weeks[2][1].carry["closing"] == totals[0]["closing"] + totals[1]["closing"]).all()
+
+def test_single_week_roll_forward_keeps_only_last_day():
+    horizon = RosterHorizon(synthetic_team(10, 2, seed=1), seed=1)
+    horizon.generate(["Week 1"])
+    last_day = horizon.weeks[0][1].codes[:, -1].copy()
+    horizon.roll_forward("Week 2")
+    carry = horizon.weeks[0][1].carry
+    assert carry["incharge"].sum() == carry["closing"].sum() == 0
+    assert carry["hours"].sum() == 0
+    assert (carry["last_day"] == last_day).all()
@@ -0,0 +1,44 @@
+import io
+import pytest
+from ingest import ingest_weekly_requests_csv
+from roster import ALL_DAYS, Staff
+from store import load_staff_from_db, save_staff_to_db
+
+CSV = """Staff Name,Week,Requested Off Days
+Ann,Week 1,"1,3"
+Ann,Week 2,7
+Bob,Week 1,8
+Zed,Week 1,1
+,Week 1,2
+Bob,,2
+Bob,Week 2,
+"""
+
+def test_rows_are_accepted_or_rejected_with_a_reason():
+    team = [Staff("Ann", "Crew", ALL_DAYS), Staff("Bob", "Crew", ALL_DAYS)]
+    report = ingest_weekly_requests_csv(io.StringIO(CSV), staff_list=team, batch_size=2)
+    assert (report["rows"], report["accepted"], report["rejected"]) == (7, 3, 4)
+    assert [(r["line"], r["reason"]) for r in report["rejects"]] == [
+        (4, "invalid day number '8' (expected 1-7)"),
+        (5, "unknown staff 'Zed'"),
+        (6, "missing staff name"),
+        (7, "missing week"),
+    ]
+    assert team[0].weekly_off_requests == {"Week 1": ["Monday", "Wednesday"], "Week 2": ["Sunday"]}
+    assert team[1].weekly_off_requests == {"Week 2": []}
+    assert report["batches"] == 2
+
+def test_missing_columns_are_an_error():
+    with pytest.raises(ValueError, match="Requested Off Days"):
+        ingest_weekly_requests_csv(io.StringIO("Staff Name,Week\nAnn,Week 1\n"), staff_list=[])
+
+def test_store_target_gets_the_same_requests(tmp_path):
+    db = str(tmp_path / "staff.db")
+    save_staff_to_db([Staff("Ann", "Crew", ALL_DAYS), Staff("Bob", "Crew", ALL_DAYS)], {}, db)
+    report = ingest_weekly_requests_csv(io.BytesIO(CSV.encode("utf-8")), db_file=db)
+    assert (report["accepted"], report["rejected"]) == (3, 4)
+    ann, bob = load_staff_from_db(db)[0]
+    assert ann.weekly_off_requests == {"Week 1": ["Monday", "Wednesday"], "Week 2": ["Sunday"]}
+    assert bob.weekly_off_requests == {}
+    with pytest.raises(ValueError, match="target"):
+        ingest_weekly_requests_csv(io.StringIO(CSV))
@@ -0,0 +1,46 @@
+import numpy as np
+from intervals import IntervalIndex
+from roster import RosterGenerator, Staff
+
+def test_overlap_is_half_open():
+    index = IntervalIndex()
+    assert index.add("k", 600, 660, "Training") is None
+    assert index.overlapping("k", 540, 600) is None
+    assert index.overlapping("k", 660, 720) is None
+    assert index.overlapping("k", 659, 700) == ("Training", 600, 660)
+    assert index.overlapping("k", 500, 900) == ("Training", 600, 660)
+    assert index.overlapping("other", 600, 660) is None
+
+def test_add_refuses_overlaps_and_keeps_order():
+    index = IntervalIndex()
+    assert index.add("k", 900, 960, "b") is None
+    assert index.add("k", 600, 660, "a") is None
+    assert index.add("k", 1200, 1260, "c") is None
+    assert index.add("k", 630, 1000, "clash") == ("b", 900, 960)
+    assert index.add("k", 630, 700, "clash") == ("a", 600, 660)
+    assert index.intervals("k") == [("a", 600, 660), ("b", 900, 960), ("c", 1200, 1260)]
+    assert index.overlapping("k", 950, 1210) == ("c", 1200, 1260)
+    assert index.overlapping("k", 961, 1199) is None
+
+def test_empty_intervals_are_ignored():
+    index = IntervalIndex()
+    assert index.add("k", 600, 600, "empty") is None
+    assert index.intervals("k") == []
+    index.add("k", 600, 660, "a")
+    assert index.overlapping("k", 630, 630) is None
+
+def test_copy_is_independent():
+    index = IntervalIndex()
+    index.add("k", 600, 660, "a")
+    clone = index.copy()
+    clone.add("k", 700, 760, "b")
+    assert index.intervals("k") == [("a", 600, 660)]
+    assert len(clone.intervals("k")) == 2
+
+def test_training_blocks_overlapping_shifts():
+    team = [Staff(f"S{k}", "Crew", ["Monday"], min_off_days=0) for k in range(3)]
+    training = {"S0": {"Monday": ("10:00", "12:00")}, "S1": {"Monday": ("20:00", "21:00")}}
+    planner = RosterGenerator(team, training_schedule=training, min_staff_weekday=3)
+    planner.generate_codes()
+    assert planner.training_conflicts() == []
+    assert np.isclose(planner.training_hours, [2, 1, 0]).all()
@@ -0,0 +1,43 @@
+import pandas as pd
+import pytest
+from benchmark import synthetic_team
+from horizon import consecutive_weeks
+from offday_calendar import AVAILABLE, REQUESTED, OffdayCalendar, generate_offday_matrix
+from roster import ALL_DAYS
+
+def old_matrix(staff_list, week_id):
+    # The per-cell builder generate_offday_matrix replaced.
+    matrix = {"Staff": [], **{day: [] for day in ALL_DAYS}}
+    for staff in staff_list:
+        matrix["Staff"].append(staff.name)
+        requested = staff.weekly_off_requests.get(week_id, [])
+        for day in ALL_DAYS:
+            if day in requested:
+                matrix[day].append("🛌 Requested")
+            elif day not in staff.availability:
+                matrix[day].append("🚫 Unavailable")
+            else:
+                matrix[day].append("✅ Available")
+    return pd.DataFrame(matrix)
+
+@pytest.mark.parametrize("seed", range(3))
+def test_week_matrix_is_unchanged(seed):
+    team = synthetic_team(40, 4, seed=seed, request_density=0.3)
+    team[0].weekly_off_requests["Week 2"] = ["Funday", "Monday"]
+    team[1].availability = []
+    for week_id in consecutive_weeks(1, 5):
+        pd.testing.assert_frame_equal(generate_offday_matrix(team, week_id), old_matrix(team, week_id))
+
+def test_counts_and_pages_follow_the_status_array():
+    team = synthetic_team(30, 3, seed=4, request_density=0.3)
+    weeks = consecutive_weeks(1, 3)
+    calendar = OffdayCalendar(team, weeks)
+    frames = [old_matrix(team, week_id) for week_id in weeks]
+    for k, frame in enumerate(frames):
+        assert calendar.counts().iloc[k].tolist() == (frame[ALL_DAYS] == "✅ Available").sum().tolist()
+        assert calendar.counts(REQUESTED).iloc[k].tolist() == (frame[ALL_DAYS] == "🛌 Requested").sum().tolist()
+    assert calendar.week_totals(AVAILABLE).tolist() == [int((f[ALL_DAYS] == "✅ Available").values.sum()) for f in frames]
+    page = calendar.page(start=10, size=5, first_week=1, last_week=3)
+    assert page.index.tolist() == [s.name for s in team[10:15]]
+    assert page.shape == (5, 14) and page.columns[0] == "Week 2 Mon"
+    assert page.iloc[0].tolist() == [status.split()[0] for f in frames[1:] for status in f.loc[10, ALL_DAYS]]
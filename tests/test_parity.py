@@ -0,0 +1,58 @@
+import hashlib
+import json
+import math
+import os
+import random
+import pytest
+import roster
+from utils import load_staff_from_json
+
+# Unseeded generation must keep producing the rosters of the original loop-based scheduler.
+# parity_digests.json holds one digest per case, taken from the baseline commit's output.
+# The two cases marked "In-Charge rule" differ on purpose: the baseline never enforced
+# enforce_non_consecutive_incharge, and their digests come from the fixed scheduler.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SIZES = [12, 3, 8, 30, 300]
+RULES = [
+    {},
+    dict(max_closing_per_week=2, max_incharge_per_week=1, min_staff_weekday=3),
+    dict(enforce_non_consecutive_closing=False, closing_hour="22:00"),
+]
+
+with open(os.path.join(os.path.dirname(__file__), "parity_digests.json")) as f:
+    EXPECTED = json.load(f)
+
+def team(seed, n):
+    rng = random.Random(seed)
+    staff_list = []
+    for k in range(n):
+        days = [d for d in roster.ALL_DAYS if rng.random() < 0.85] or ["Monday"]
+        s = roster.Staff(f"S{k}", "Crew", days, max_hours=44, min_off_days=rng.choice([1, 2, 3]))
+        s.weekly_off_requests = {"Week 1": rng.sample(roster.ALL_DAYS, rng.choice([0, 0, 1, 2]))}
+        staff_list.append(s)
+    return staff_list
+
+def _plain(value):
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return value
+
+def digest(table, index, summary, violations):
+    rows = [[_plain(v) for v in row] for row in table]
+    summary = [[_plain(v.item() if hasattr(v, "item") else v) for v in row] for row in summary]
+    payload = json.dumps([rows, list(index), summary, list(violations)], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def run_case(seed, rules):
+    staff_list = team(seed, SIZES[seed % 5]) if seed % 7 else load_staff_from_json(os.path.join(ROOT, "staff_data.json"))[0]
+    random.seed(seed)
+    planner = roster.RosterGenerator(staff_list, **RULES[rules])
+    df = planner.generate()
+    return digest(df.astype(object).values.tolist(), df.index, planner.summary().values.tolist(), planner.list_violations())
+
+@pytest.mark.parametrize("case", EXPECTED["cases"], ids=lambda c: f"seed{c['seed']}-rules{c['rules']}")
+def test_matches_baseline(case):
+    assert run_case(case["seed"], case["rules"]) == case["digest"]
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+from benchmark import synthetic_team
+from offday_calendar import OFFDAY_STATUSES
+from roster import ALL_DAYS, MORNING, AFTERNOON, OFF, RosterGenerator
+from utils import load_staff_from_json
+
+REQUESTED, AVAILABLE = OFFDAY_STATUSES[:2]
+
+def planned(seed):
+    team = synthetic_team(20, 1, seed=seed)
+    planner = RosterGenerator(team, seed=seed)
+    planner.generate_codes()
+    return team, planner
+
+def test_bad_input_is_rejected_before_requests_change():
+    team = load_staff_from_json("staff_data.json")[0]
+    planner = RosterGenerator(team)
+    planner.generate_codes()
+    before = [dict(s.weekly_off_requests) for s in team]
+    with pytest.raises(ValueError, match="Unknown day"):
+        planner.repair(team[0].name, "Week 1", "Noday", REQUESTED)
+    with pytest.raises(ValueError, match="status"):
+        planner.repair(team[0].name, "Week 1", "Monday", "maybe")
+    with pytest.raises(ValueError, match="Week 1"):
+        planner.repair(team[0].name, "Week 2", "Monday", REQUESTED)
+    assert [s.weekly_off_requests for s in team] == before
+
+@pytest.mark.parametrize("seed", range(10))
+def test_edit_that_changes_nothing_keeps_the_roster(seed):
+    team, planner = planned(seed)
+    codes = planner.codes.copy()
+    i, d = next((i, d) for i, d in zip(*np.nonzero(planner.available))
+                if ALL_DAYS[d] not in team[i].weekly_off_requests.get("Week 1", []))
+    assert planner.repair(team[i].name, "Week 1", ALL_DAYS[d], AVAILABLE) == []
+    assert (planner.codes == codes).all()
+
+@pytest.mark.parametrize("seed", range(10))
+def test_requested_shift_is_taken_off_and_only_that_day_changes(seed):
+    team, planner = planned(seed)
+    codes = planner.codes.copy()
+    i, d = next(zip(*np.nonzero(np.isin(codes, (MORNING, AFTERNOON)))))
+    changed = planner.repair(team[i].name, "Week 1", ALL_DAYS[d], REQUESTED)
+    assert planner.codes[i, d] == OFF
+    assert (team[i].name, ALL_DAYS[d]) in [cell[:2] for cell in changed]
+    assert len(changed) == (planner.codes != codes).sum() <= 3
+    assert team[i].schedule[ALL_DAYS[d]] is None
@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+from roster import ALL_DAYS, CLOSING, IN_CHARGE, RosterGenerator, Staff
+
+def team(n, **options):
+    return [Staff(f"S{k}", "Crew", ALL_DAYS, min_off_days=0, **options) for k in range(n)]
+
+def test_availability_cannot_go_stale():
+    staff = Staff("Ann", "Crew", ["Monday"])
+    with pytest.raises(AttributeError):
+        staff.availability.append("Tuesday")
+    staff.availability = ["Monday", "Sunday"]
+    assert staff.availability == ("Monday", "Sunday")
+    assert staff.availability_mask == 0b1000001
+    assert staff.is_available("Sunday") and not staff.is_available("Tuesday")
+
+def test_least_used_person_is_picked_with_ties_to_the_earlier_one():
+    planner = RosterGenerator(team(4), enforce_non_consecutive_closing=False)
+    planner.generate_codes()
+    picks = [int(np.flatnonzero(planner.codes[:, d] == IN_CHARGE)[0]) for d in range(len(ALL_DAYS))]
+    assert picks == [0, 1, 2, 3, 0, 1, 2]
+    closes = (planner.codes == CLOSING).sum(axis=1)
+    assert closes.sum() == 7 and closes.max() - closes.min() <= 1
+
+def test_skipped_people_come_back_on_later_days():
+    staff_list = team(3)
+    staff_list[0].availability = ["Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+    planner = RosterGenerator(staff_list, max_incharge_per_week=3)
+    planner.generate_codes()
+    incharge = (planner.codes == IN_CHARGE)
+    assert not incharge[0, :2].any()
+    assert incharge.sum(axis=1).max() <= 3
+    assert (incharge.sum(axis=0) == 1).all()
+    assert not (incharge[:, 1:] & incharge[:, :-1]).any()
@@ -0,0 +1,52 @@
+import datetime
+import os
+from store import import_staff_json, load_staff_from_db, save_staff_to_db, staff_names, upsert_offday_request, upsert_offday_requests
+from utils import load_staff_from_json
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _fields(staff_list):
+    return [(s.name, s.role, list(s.availability), s.max_hours, s.min_off_days, s.weekly_off_requests) for s in staff_list]
+
+def test_round_trip_matches_the_json_file(tmp_path):
+    db = str(tmp_path / "staff.db")
+    source = os.path.join(ROOT, "staff_data.json")
+    staff_list, training = load_staff_from_json(source)
+    assert import_staff_json(source, db) == len(staff_list)
+    loaded, loaded_training = load_staff_from_db(db)
+    assert _fields(loaded) == _fields(staff_list)
+    assert loaded_training == training
+    assert staff_names(db) == {s.name for s in staff_list}
+    training = {staff_list[2].name: {"Tuesday": (datetime.time(9, 0), datetime.time(10, 30))}}
+    save_staff_to_db(staff_list[::-1], training, db)
+    loaded, loaded_training = load_staff_from_db(db)
+    assert _fields(loaded) == _fields(staff_list[::-1])
+    assert loaded_training == training
+
+def test_week_load_reads_only_that_week(tmp_path):
+    db = str(tmp_path / "staff.db")
+    staff_list, training = load_staff_from_json(os.path.join(ROOT, "staff_data.json"))
+    staff_list[0].weekly_off_requests = {"Week 1": ["Monday"], "Week 2": ["Friday", "Sunday"]}
+    save_staff_to_db(staff_list, training, db)
+    week, _ = load_staff_from_db(db, "Week 2")
+    assert week[0].weekly_off_requests == {"Week 2": ["Friday", "Sunday"]}
+    assert all(set(s.weekly_off_requests) <= {"Week 2"} for s in week)
+    # Saving staff loaded for one week keeps the other weeks' requests.
+    save_staff_to_db(week, training, db)
+    assert load_staff_from_db(db)[0][0].weekly_off_requests == staff_list[0].weekly_off_requests
+
+def test_upsert_replaces_or_clears_one_week(tmp_path):
+    db = str(tmp_path / "staff.db")
+    staff_list, training = load_staff_from_json(os.path.join(ROOT, "staff_data.json"))
+    for s in staff_list:
+        s.weekly_off_requests = {}
+    save_staff_to_db(staff_list, training, db)
+    name, other = staff_list[0].name, staff_list[1].name
+    upsert_offday_request(name, "Week 3", ["Tuesday"], db)
+    upsert_offday_request(name, "Week 3", ["Wednesday", "Thursday"], db)
+    upsert_offday_requests([(other, "Week 3", ["Monday"]), (name, "Week 4", ["Sunday"])], db)
+    by_name = {s.name: s.weekly_off_requests for s in load_staff_from_db(db)[0]}
+    assert by_name[name] == {"Week 3": ["Wednesday", "Thursday"], "Week 4": ["Sunday"]}
+    assert by_name[other] == {"Week 3": ["Monday"]}
+    upsert_offday_request(name, "Week 3", [], db)
+    assert load_staff_from_db(db, "Week 3")[0][0].weekly_off_requests == {}
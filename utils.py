@@ -1,6 +1,5 @@
 import json
 import datetime
-import pandas as pd
 from roster import Staff
 from collections import defaultdict
 